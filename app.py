@@ -1,37 +1,92 @@
 from flask import Flask, render_template, jsonify, request, send_from_directory, send_file, redirect, url_for, make_response, g, Response, stream_with_context
+from flask.json.provider import JSONProvider
 import mysql.connector
 import os
 from mysql.connector import pooling
 import random
 import threading
+import socket
+import sys
+import atexit
+import queue
+import logging
+import logging.handlers
+import concurrent.futures
 from werkzeug.routing import BaseConverter
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, quote
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import urllib3.connection
+import urllib3.util.connection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+import lxml.etree
+import lxml.html
+from lxml.etree import ParserError
+from urllib.parse import urljoin, quote, urlsplit
 import re
-import html
 import json
+import orjson
 import unicodedata
 import time
-import base64
+import binascii
 import hashlib
+import itertools
+import gzip
 import mimetypes
 import io
 import zipfile
+import zlib
 from urllib.parse import urlparse
-from functools import wraps
-from datetime import datetime
+from functools import wraps, lru_cache
+from datetime import datetime, timedelta
+from decimal import Decimal
 from contextlib import contextmanager
-import traceback
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+from PIL import Image
 
 # Import authentication modules
-from auth_utils import generate_magic_link_token, generate_session_token, verify_token, refresh_session_token, generate_otp, store_otp, verify_otp, hash_api_token, generate_api_token
+from auth_utils import generate_session_token, verify_token, refresh_session_token, generate_otp, store_otp, verify_otp, hash_api_token, generate_api_token, OTP_EXPIRY
 from email_service import send_otp_email, send_welcome_email
-from audit_helpers import record_audit, snapshot_board, snapshot_pin, snapshot_section
+from audit_helpers import AUDIT_INSERT_SQL, audit_params, record_audit, snapshot_board, snapshot_pin, snapshot_section
 from csrf import issue_csrf_token, require_csrf
 import event_bus
 
+# Log records are queued on the calling thread and written to stdout by a
+# background listener, so a request never blocks on a slow log pipe.
+_log_stream = logging.StreamHandler(sys.stdout)
+_log_stream.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+_log_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+# Only the message (and traceback) is rendered before queueing; the stream
+# handler adds the timestamp/level prefix. Without this basicConfig would give
+# the QueueHandler its default "LEVEL:name:" format and prefix lines twice.
+_log_handler.setFormatter(logging.Formatter('%(message)s'))
+_log_listener = None
+
+def _start_log_listener():
+    """
+    Point the root QueueHandler at a fresh queue and start a listener thread
+    draining it. Runs at import and again in every forked worker (e.g.
+    gunicorn --preload), since the parent's listener thread doesn't survive
+    fork and records queued in the child would otherwise never be written.
+    """
+    global _log_listener
+    _log_handler.queue = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(_log_handler.queue, _log_stream)
+    _log_listener.start()
+
+def _stop_log_listener():
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+_start_log_listener()
+atexit.register(_stop_log_listener)
+os.register_at_fork(after_in_child=_start_log_listener)
+logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
+logger = logging.getLogger('scrapbook')
+
 # This base image's /etc/mime.types doesn't know .webp, which makes
 # send_from_directory fall back to application/octet-stream (forcing a
 # download instead of inline display) for cached images served as WebP.
@@ -43,7 +98,7 @@ try:
     REDIS_AVAILABLE = True
 except ImportError:
     REDIS_AVAILABLE = False
-    print("Redis module not available, running without cache")
+    logger.info("Redis module not available, running without cache")
 
 # Load version from VERSION file
 try:
@@ -54,6 +109,34 @@ except FileNotFoundError:
 
 app = Flask(__name__, static_folder='static')
 
+
+def _orjson_default(o):
+    """Serialize the column types orjson doesn't handle natively."""
+    if isinstance(o, Decimal):
+        # Match Flask's default provider, which emits Decimals as strings.
+        return str(o)
+    if isinstance(o, (bytes, bytearray)):
+        return o.decode('utf-8', errors='replace')
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider backed by orjson. Every jsonify() call routes through here,
+    so large pin/board listings are encoded in C instead of the stdlib json
+    module. Naive datetimes from the DB are emitted as ISO 8601 UTC.
+    """
+    _options = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self._options, default=_orjson_default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+app.json = OrjsonProvider(app)
+
 # Redis configuration
 if REDIS_AVAILABLE:
     try:
@@ -64,57 +147,164 @@ if REDIS_AVAILABLE:
             decode_responses=True
         )
         redis_client.ping()  # Test the connection
-        print("Redis connection successful")
+        # Cached views are stored gzip-compressed, so they need a client that
+        # hands back raw bytes instead of decoding every hit.
+        redis_view_client = redis.Redis(
+            host='redis',
+            port=6379,
+            db=0,
+            decode_responses=False
+        )
+        logger.info("Redis connection successful")
     except (redis.ConnectionError, redis.ResponseError):
-        print("Redis not available, running without cache")
+        logger.info("Redis not available, running without cache")
         redis_client = None
+        redis_view_client = None
 else:
     redis_client = None
+    redis_view_client = None
 
 # Wire pub/sub into the event bus (falls back to in-memory if redis_client is None)
 event_bus.init(redis_client)
 
-# Cache decorator
-def cache_view(timeout=300):
+# Format tag stored with every cached page. Bump it when the entry layout or
+# body encoding changes so entries written by older code are re-rendered
+# rather than misread.
+VIEW_CACHE_FORMAT = b'1'
+
+def _cached_page_response(entry):
+    """
+    Build a response from a cached page entry (a hash of the gzip-compressed
+    body, its content type and ETag). Answers 304 when the client already holds
+    the same ETag; otherwise the body is served as-is when the client accepts
+    gzip and decompressed when it doesn't. Returns None if the entry can't be
+    decoded so the caller can render the view instead.
+    """
+    if entry.get(b'v') != VIEW_CACHE_FORMAT:
+        return None
+    compressed = entry.get(b'body')
+    etag = entry.get(b'etag', b'').decode('ascii', 'ignore')
+    content_type = entry.get(b'content_type', b'text/html; charset=utf-8').decode('ascii', 'ignore')
+    if compressed is None:
+        return None
+    if etag and etag in request.if_none_match:
+        response = Response(status=304)
+    elif 'gzip' in request.accept_encodings:
+        response = Response(compressed, content_type=content_type)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        try:
+            body = gzip.decompress(compressed)
+        except (OSError, EOFError):
+            return None
+        response = Response(body, content_type=content_type)
+    if etag:
+        response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+# Cache decorator. key (formatted with user_id) names the entry, which writes
+# invalidate explicitly; requests with a query string bypass the cache.
+# Entries keep the content type and an ETag alongside the gzip body so hits
+# are real responses and browsers can revalidate with If-None-Match.
+def cache_view(key, timeout=300):
     def decorator(f):
         @wraps(f)
         def wrapper(*args, **kwargs):
             # Skip caching in development mode
             if os.getenv('FLASK_ENV') == 'development':
                 return f(*args, **kwargs)
-            if not redis_client:
+            if not redis_client or request.method not in ('GET', 'HEAD'):
                 return f(*args, **kwargs)
-            # Include user_id in key so each user has their own cached view
-            token = request.cookies.get('session_token')
-            user_id = 'anon'
-            if token:
-                try:
-                    payload = verify_token(token, token_type='session')
-                    if payload:
-                        user_id = str(payload.get('user_id', 'anon'))
-                except Exception:
-                    pass
-            qs = request.query_string.decode('utf-8')
-            cache_key = f"view:{user_id}:{request.path}{'?' + qs if qs else ''}"
-            cached_data = redis_client.get(cache_key)
-            if cached_data:
-                return cached_data
-            response = f(*args, **kwargs)
+            # Include user_id in key so each user has their own cached view.
+            # get_current_user() is memoized per request, so this reuses the
+            # token check login_required already did instead of repeating it.
+            user = get_current_user()
+            user_id = str(user['id']) if user else 'anon'
+            if request.query_string:
+                return f(*args, **kwargs)
+            cache_key = key.format(user_id=user_id)
+            cached_entry = redis_view_client.hgetall(cache_key)
+            if cached_entry:
+                cached_response = _cached_page_response(cached_entry)
+                if cached_response is not None:
+                    return cached_response
+            rv = f(*args, **kwargs)
             # Don't cache error tuples — pass them through unchanged
-            if isinstance(response, tuple):
+            if isinstance(rv, tuple):
+                return rv
+            response = make_response(rv)
+            if response.status_code != 200 or response.direct_passthrough:
                 return response
-            # Store and return HTML responses
-            if hasattr(response, 'data'):
-                redis_client.setex(cache_key, timeout, response.data.decode('utf-8'))
-            elif isinstance(response, str):
-                redis_client.setex(cache_key, timeout, response)
-            return response
+            response.add_etag()
+            etag, _ = response.get_etag()
+            pipe = redis_view_client.pipeline(transaction=False)
+            pipe.hset(cache_key, mapping={
+                'v': VIEW_CACHE_FORMAT,
+                'body': gzip.compress(response.get_data(), compresslevel=6),
+                'etag': etag,
+                'content_type': response.content_type,
+            })
+            pipe.expire(cache_key, timeout)
+            pipe.execute()
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response.make_conditional(request)
         return wrapper
     return decorator
 
 # Cache configuration
 app.config['CACHE_DEFAULT_TIMEOUT'] = 300  # 5 minutes
 
+# The gallery is invalidated on every write that changes it; the TTL is only a
+# safety net for writes that bypass the app.
+GALLERY_CACHE_KEY = 'gallery:{user_id}:page'
+GALLERY_CACHE_TIMEOUT = 3600
+
+def invalidate_cache(keys):
+    """
+    Drop cached entries in a single round trip. UNLINK frees the values on a
+    Redis background thread rather than blocking on large pages.
+    """
+    if not redis_client or not keys:
+        return
+    try:
+        redis_client.unlink(*keys)
+    except Exception as e:
+        logger.error(f"Failed to invalidate cache keys {keys}: {e}")
+
+# id/name list of a user's boards for the board pickers (board, pin and
+# add-content pages). Dropped with the gallery on every board change; the TTL
+# only covers writes made outside the app.
+BOARD_LIST_KEY = 'boards:{user_id}'
+BOARD_LIST_TIMEOUT = 3600
+
+def invalidate_gallery(user_id):
+    """Drop a user's cached gallery page and board list after their boards or pins change."""
+    invalidate_cache([
+        GALLERY_CACHE_KEY.format(user_id=user_id),
+        BOARD_LIST_KEY.format(user_id=user_id),
+    ])
+
+# Id range of a user's pins, used by /random to seek straight to a pin. Every
+# path that inserts or deletes pins drops it via invalidate_pin_caches, so the
+# TTL is only a backstop for writes made outside the app (scripts, restores).
+PIN_ID_BOUNDS_KEY = 'pins:{user_id}:id_bounds'
+PIN_ID_BOUNDS_TIMEOUT = 3600
+
+def invalidate_pin_caches(user_id):
+    """
+    Drop the gallery page, board list, the /random id range and the link
+    health totals after pins are added or removed. Board deletes and
+    undos also come through here, hence the board list.
+    """
+    invalidate_cache([
+        GALLERY_CACHE_KEY.format(user_id=user_id),
+        BOARD_LIST_KEY.format(user_id=user_id),
+        PIN_ID_BOUNDS_KEY.format(user_id=user_id),
+        LINK_HEALTH_STATS_KEY.format(user_id=user_id),
+    ])
+
 # Define and register SlugConverter
 class SlugConverter(BaseConverter):
     regex = r'[a-zA-Z0-9-]+'
@@ -122,28 +312,70 @@ class SlugConverter(BaseConverter):
 app.url_map.converters['slug'] = SlugConverter
 
 # Input sanitization utilities
+
+# str.translate deletion table for every Basic Multilingual Plane codepoint in
+# Unicode category "C" (control, format, surrogate, private use, unassigned).
+# Astral characters (emoji etc.) fall back to a per-character category check.
+# Tab, newline and carriage return are kept so multi-line notes survive
+_KEPT_CONTROLS = frozenset('\t\n\r')
+_CTRL_TABLE = dict.fromkeys(
+    cp for cp in range(0x10000)
+    if unicodedata.category(chr(cp))[0] == 'C' and chr(cp) not in _KEPT_CONTROLS
+)
+
+def make_sanitizer(max_length=None):
+    """
+    Build a sanitize_string specialised to one max_length, so the hot call
+    sites below don't re-check the limit on every call. The returned function
+    takes the raw value and returns the cleaned, truncated string. Values are
+    stored unescaped; Jinja autoescaping and escapeHtml() in the templates
+    escape them where they are rendered.
+    """
+    def sanitize(s):
+        if not isinstance(s, str):
+            return ''
+        
+        # ASCII is already NFKC; otherwise let the quick check skip normalized input
+        if not s.isascii() and not unicodedata.is_normalized('NFKC', s):
+            s = unicodedata.normalize('NFKC', s)
+        
+        # Remove any control characters
+        s = s.translate(_CTRL_TABLE)
+        if s and max(s) > '\uffff':
+            s = ''.join(char for char in s
+                        if char in _KEPT_CONTROLS or unicodedata.category(char)[0] != 'C')
+        
+        # Trim whitespace and apply the length limit (s[:None] is a no-op)
+        return s.strip()[:max_length]
+    return sanitize
+
+sanitize_title = make_sanitizer(255)  # pin titles
+sanitize_name = make_sanitizer(100)   # board names
+sanitize_alt = make_sanitizer(200)    # scraped image alt text
+sanitize_text = make_sanitizer(None)  # descriptions and notes
+
+_sanitizers = {}
+
 def sanitize_string(s, max_length=None):
-    if not isinstance(s, str):
-        return ''
-    
-    # Convert to string and normalize unicode
-    s = str(s)
-    s = unicodedata.normalize('NFKC', s)
-    
-    # Remove any HTML entities
-    s = html.escape(s)
-    
-    # Remove any control characters
-    s = ''.join(char for char in s if unicodedata.category(char)[0] != 'C')
-    
-    # Trim whitespace
-    s = s.strip()
-    
-    # Apply length limit if specified
-    if max_length and len(s) > max_length:
-        s = s[:max_length]
-    
-    return s
+    """General form for one-off limits; builds each specialisation once."""
+    max_length = max_length or None
+    sanitizer = _sanitizers.get(max_length)
+    if sanitizer is None:
+        sanitizer = _sanitizers[max_length] = make_sanitizer(max_length)
+    return sanitizer(s)
+
+# Basic URL validation regex for HTTP/HTTPS URLs. Left in Unicode mode: under
+# re.ASCII the trailing \S would start accepting non-ASCII whitespace.
+_URL_RE = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+# Runs of anything that isn't a lowercase ASCII letter or digit, for board slugs
+_SLUG_RE = re.compile(r'[^a-z0-9]+', re.ASCII)
 
 def sanitize_url(url, max_length=2048):
     if not isinstance(url, str):
@@ -160,20 +392,19 @@ def sanitize_url(url, max_length=2048):
     if url.startswith('/static/'):
         return url
     
-    # Basic URL validation regex for HTTP/HTTPS URLs
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+    # Apply length limit before running the regex over an oversized string
+    if len(url) > max_length:
+        return ''
     
-    if not url_pattern.match(url):
+    # urlsplit is cheap; only URLs with an http(s) scheme and a host get the regex
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return ''
+    if parts.scheme.lower() not in ('http', 'https') or not parts.netloc:
         return ''
     
-    # Apply length limit
-    if len(url) > max_length:
+    if not _URL_RE.match(url):
         return ''
     
     return url
@@ -193,6 +424,97 @@ _URL_CHECK_HEADERS = {
 # HTTP codes that often indicate bot-blocking rather than a dead link
 _URL_CHECK_UNCLEAR = {403, 405, 429}
 
+# In-process DNS cache for link checks. They keep resolving the same hosts
+# (archive.org on every broken link), so reuse answers for a few minutes. It's
+# only wired into _URL_CHECK_SESSION's connections; every other HTTP client,
+# and the MySQL and Redis clients, still resolve hosts afresh.
+DNS_CACHE_TTL = 300
+DNS_CACHE_MAX_ENTRIES = 1024
+_dns_cache = {}
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+    hit = _dns_cache.get(key)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+    result = socket.getaddrinfo(host, port, family, type, proto, flags)
+    if len(_dns_cache) >= DNS_CACHE_MAX_ENTRIES:
+        _dns_cache.clear()
+    _dns_cache[key] = (now + DNS_CACHE_TTL, result)
+    return result
+
+class _CachedDNSConnectionMixin:
+    """urllib3 connection that resolves its host through _cached_getaddrinfo."""
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = _cached_getaddrinfo(
+                host, self.port, urllib3.util.connection.allowed_gai_family(), socket.SOCK_STREAM
+            )
+        except OSError:
+            addresses = None
+        if not addresses:
+            # Let urllib3 resolve it again and raise its usual error
+            return super()._new_conn()
+        # Connect to each resolved address in turn, as urllib3 itself does.
+        # Only the dial target changes; Host, SNI and certificate checks still
+        # use self.host.
+        err = None
+        try:
+            for ip in dict.fromkeys(info[4][0] for info in addresses):
+                self._dns_host = ip
+                try:
+                    return super()._new_conn()
+                except (ConnectTimeoutError, NewConnectionError) as e:
+                    err = e
+            raise err
+        finally:
+            self._dns_host = host
+
+class _CachedDNSHTTPConnection(_CachedDNSConnectionMixin, urllib3.connection.HTTPConnection):
+    pass
+
+class _CachedDNSHTTPSConnection(_CachedDNSConnectionMixin, urllib3.connection.HTTPSConnection):
+    pass
+
+class _CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedDNSHTTPConnection
+
+class _CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedDNSHTTPSConnection
+
+class _CachedDNSAdapter(HTTPAdapter):
+    """HTTPAdapter whose direct (non-proxied) connections use the DNS cache."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CachedDNSHTTPConnectionPool,
+            'https': _CachedDNSHTTPSConnectionPool,
+        }
+
+# Shared keep-alive session for link-health probes and Wayback lookups, so
+# pins on the same host (and every archive.org lookup) reuse connections
+# instead of doing a fresh TCP + TLS handshake per request.
+_URL_CHECK_SESSION = requests.Session()
+_URL_CHECK_SESSION.headers.update(_URL_CHECK_HEADERS)
+_url_check_adapter = _CachedDNSAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=1, backoff_factor=0.2),
+)
+_URL_CHECK_SESSION.mount('https://', _url_check_adapter)
+_URL_CHECK_SESSION.mount('http://', _url_check_adapter)
+
+# Long-lived pools for link checks, so a batch doesn't pay for thread start-up.
+# A board check runs URL_CHECK_WORKERS probes at once, each of which hands its
+# HEAD to the probe pool while it does the GET.
+URL_CHECK_WORKERS = 32
+_URL_CHECK_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=URL_CHECK_WORKERS, thread_name_prefix='url-check')
+_URL_PROBE_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=URL_CHECK_WORKERS, thread_name_prefix='url-probe')
+
 def referer_for_cdn_url(url):
     """Return an appropriate Referer header for known CDN hosts."""
     url_lower = (url or '').lower()
@@ -222,7 +544,7 @@ def cache_headers_for_url(url):
     return headers
 
 def _probe_url(url, method, timeout, headers):
-    fn = requests.head if method == 'HEAD' else requests.get
+    fn = _URL_CHECK_SESSION.head if method == 'HEAD' else _URL_CHECK_SESSION.get
     req_headers = dict(headers)
     kwargs = {'headers': req_headers, 'timeout': timeout, 'allow_redirects': True}
     if method == 'GET':
@@ -233,17 +555,45 @@ def _probe_url(url, method, timeout, headers):
         resp.close()
     return resp.status_code
 
+# Snapshots found on the Wayback Machine, so re-probing a broken link
+# doesn't ask archive.org again. Misses aren't cached: a snapshot may appear.
+ARCHIVE_CACHE_KEY = 'archive:{url_hash}'
+ARCHIVE_CACHE_TIMEOUT = 86400
+
+WAYBACK_AVAILABLE_API = 'https://archive.org/wayback/available'
+
+def _archive_cache_key(url):
+    return ARCHIVE_CACHE_KEY.format(url_hash=hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+def _cache_archive_url(url, archive_url):
+    if not redis_client:
+        return
+    try:
+        redis_client.setex(_archive_cache_key(url), ARCHIVE_CACHE_TIMEOUT, archive_url)
+    except Exception as e:
+        logger.error(f"Error writing archive cache for {url}: {e}")
+
 def _check_wayback_archive(url):
     """Check if Wayback Machine has an archive of the URL."""
+    if redis_client:
+        try:
+            cached = redis_client.get(_archive_cache_key(url))
+            if cached:
+                return cached
+        except Exception as e:
+            logger.error(f"Error reading archive cache for {url}: {e}")
     try:
-        wayback_api = f"https://archive.org/wayback/available?url={url}"
-        response = requests.get(wayback_api, timeout=5)
+        # params= encodes the URL, so links with their own query string or
+        # fragment are looked up whole
+        response = _URL_CHECK_SESSION.get(WAYBACK_AVAILABLE_API, params={'url': url}, timeout=5)
         if response.status_code == 200:
             data = response.json()
             if data.get('archived_snapshots', {}).get('closest', {}).get('available'):
-                return data['archived_snapshots']['closest']['url']
+                archive_url = data['archived_snapshots']['closest']['url']
+                _cache_archive_url(url, archive_url)
+                return archive_url
     except Exception as e:
-        print(f"Error checking Wayback Machine for {url}: {e}")
+        logger.error(f"Error checking Wayback Machine for {url}: {e}")
     return None
 
 def check_url_live_status(url, timeout=5):
@@ -254,13 +604,17 @@ def check_url_live_status(url, timeout=5):
     head_code = None
     get_code = None
 
+    # Both probes always run, so overlap them: HEAD on the shared probe pool
+    # while this thread does the GET.
+    head_future = _URL_PROBE_EXECUTOR.submit(_probe_url, url, 'HEAD', timeout, _URL_CHECK_HEADERS)
+
     try:
-        head_code = _probe_url(url, 'HEAD', timeout, _URL_CHECK_HEADERS)
+        get_code = _probe_url(url, 'GET', timeout, _URL_CHECK_HEADERS)
     except requests.RequestException:
         pass
 
     try:
-        get_code = _probe_url(url, 'GET', timeout, _URL_CHECK_HEADERS)
+        head_code = head_future.result()
     except requests.RequestException:
         pass
 
@@ -280,16 +634,37 @@ def check_url_live_status(url, timeout=5):
         return 'archived', archive_url
     return 'broken', None
 
+_UPSERT_URL_HEALTH_SQL = """
+    INSERT INTO url_health (pin_id, url, last_checked, status, archive_url)
+    VALUES (%s, %s, NOW(), %s, %s)
+    ON DUPLICATE KEY UPDATE
+    url = VALUES(url),
+    last_checked = NOW(),
+    status = VALUES(status),
+    archive_url = VALUES(archive_url),
+    claimed_until = NULL
+"""
+
+# How long a board health check holds its claim on the pins it is probing
+URL_HEALTH_CLAIM_MINUTES = 10
+
+# Set when a board check finds nothing due, expiring when the board's next pin
+# comes due (capped, so pins moved in from other boards aren't held back long).
+# Board page loads then skip the claim query entirely until there's work.
+URL_HEALTH_IDLE_KEY = 'url_health:{board_id}:idle'
+URL_HEALTH_IDLE_MAX_SECONDS = 600
+
 def _upsert_url_health(cursor, pin_id, url, status, archive_url):
-    cursor.execute("""
-        INSERT INTO url_health (pin_id, url, last_checked, status, archive_url)
-        VALUES (%s, %s, NOW(), %s, %s)
-        ON DUPLICATE KEY UPDATE
-        url = VALUES(url),
-        last_checked = NOW(),
-        status = VALUES(status),
-        archive_url = VALUES(archive_url)
-    """, (pin_id, url, status, archive_url))
+    cursor.execute(_UPSERT_URL_HEALTH_SQL, (pin_id, url, status, archive_url))
+
+def _upsert_url_health_many(cursor, rows):
+    """
+    Upsert many (pin_id, url, status, archive_url) rows at once. executemany
+    rewrites this into a single multi-row INSERT, so a whole batch costs one
+    round trip.
+    """
+    if rows:
+        cursor.executemany(_UPSERT_URL_HEALTH_SQL, rows)
 
 def sanitize_integer(value, min_value=None, max_value=None):
     try:
@@ -302,6 +677,16 @@ def sanitize_integer(value, min_value=None, max_value=None):
     except (TypeError, ValueError):
         return None
 
+# Placeholder sizes for external images, from common Pinterest aspect ratios
+_PLACEHOLDER_DIMENSIONS = (
+    (400, 600),   # Portrait: 2:3 ratio (most common)
+    (400, 500),   # Portrait: 4:5 ratio
+    (400, 400),   # Square: 1:1 ratio
+    (400, 300),   # Landscape: 4:3 ratio
+    (400, 533),   # Portrait: 3:4 ratio
+    (400, 800),   # Tall portrait: 1:2 ratio
+)
+
 def calculate_image_dimensions(image_url, timeout=2):
     """Calculate image dimensions for a given URL - optimized for speed"""
     try:
@@ -310,13 +695,11 @@ def calculate_image_dimensions(image_url, timeout=2):
             if image_url.startswith('/cached/'):
                 cached_path = os.path.join('static', 'cached_images', image_url[8:])
                 if os.path.exists(cached_path):
-                    from PIL import Image
                     with Image.open(cached_path) as img:
                         return img.size  # Returns (width, height)
             elif image_url.startswith('/static/'):
                 static_path = image_url[1:]  # Remove leading slash
                 if os.path.exists(static_path):
-                    from PIL import Image
                     with Image.open(static_path) as img:
                         return img.size
             return None
@@ -324,25 +707,15 @@ def calculate_image_dimensions(image_url, timeout=2):
         # For external URLs - use intelligent defaults based on common Pinterest patterns
         # This avoids slow network requests that can block the UI
         if image_url.startswith('http'):
-            # Return intelligent defaults based on URL patterns or random selection
-            import random
-            # Common Pinterest aspect ratios
-            aspect_ratios = [
-                (400, 600),   # Portrait: 2:3 ratio (most common)
-                (400, 500),   # Portrait: 4:5 ratio
-                (400, 400),   # Square: 1:1 ratio
-                (400, 300),   # Landscape: 4:3 ratio
-                (400, 533),   # Portrait: 3:4 ratio
-                (400, 800),   # Tall portrait: 1:2 ratio
-            ]
-            # Use a deterministic but varied selection based on URL hash
-            url_hash = hash(image_url) % len(aspect_ratios)
-            return aspect_ratios[url_hash]
+            # Deterministic but varied pick per URL. crc32 is stable across
+            # processes, unlike hash(), which is salted per interpreter.
+            url_hash = zlib.crc32(image_url.encode('utf-8', 'ignore'))
+            return _PLACEHOLDER_DIMENSIONS[url_hash % len(_PLACEHOLDER_DIMENSIONS)]
             
         return None
         
     except Exception as e:
-        print(f"Error calculating dimensions for {image_url}: {e}")
+        logger.error(f"Error calculating dimensions for {image_url}: {e}")
         return None
 
 def update_pin_dimensions(pin_id, image_url):
@@ -351,77 +724,55 @@ def update_pin_dimensions(pin_id, image_url):
     Creates a cached_images record if one doesn't exist, with dimensions only.
     This is used for immediate dimension availability before full caching completes.
     """
-    db = None
-    cursor = None
     try:
         dimensions = calculate_image_dimensions(image_url)
         if not dimensions:
             return False
         
         width, height = dimensions
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        
-        # First, check if a cached_images record already exists for this URL
-        cursor.execute("""
-            SELECT id, width, height FROM cached_images 
-            WHERE original_url = %s AND quality_level = 'low'
-            LIMIT 1
-        """, (image_url,))
-        cached_record = cursor.fetchone()
-        
-        if cached_record:
-            cache_id = cached_record['id']
-            # Only update dimensions if they're not already set
-            if not cached_record['width'] or not cached_record['height']:
+        with tx(dictionary=True) as (db, cursor):
+            # First, check if a cached_images record already exists for this URL
+            cursor.execute("""
+                SELECT id, width, height FROM cached_images 
+                WHERE original_url = %s AND quality_level = 'low'
+                LIMIT 1
+            """, (image_url,))
+            cached_record = cursor.fetchone()
+            
+            if cached_record:
+                cache_id = cached_record['id']
+                # Only update dimensions if they're not already set
+                if not cached_record['width'] or not cached_record['height']:
+                    cursor.execute("""
+                        UPDATE cached_images 
+                        SET width = %s, height = %s, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = %s
+                    """, (width, height, cache_id))
+            else:
+                # Create a new cached_images record with dimensions only
+                # The actual image caching will happen in the background
+                url_hash = hashlib.md5(image_url.encode()).hexdigest()[:16]
+                placeholder_filename = f"{url_hash}_pending.placeholder"
+                
                 cursor.execute("""
-                    UPDATE cached_images 
-                    SET width = %s, height = %s, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """, (width, height, cache_id))
-        else:
-            # Create a new cached_images record with dimensions only
-            # The actual image caching will happen in the background
-            import hashlib
-            url_hash = hashlib.md5(image_url.encode()).hexdigest()[:16]
-            placeholder_filename = f"{url_hash}_pending.placeholder"
+                    INSERT INTO cached_images 
+                    (original_url, cached_filename, file_size, width, height, quality_level, cache_status)
+                    VALUES (%s, %s, 0, %s, %s, 'low', 'pending')
+                """, (image_url, placeholder_filename, width, height))
+                cache_id = cursor.lastrowid
             
+            # Link the pin to the cached_images record
             cursor.execute("""
-                INSERT INTO cached_images 
-                (original_url, cached_filename, file_size, width, height, quality_level, cache_status)
-                VALUES (%s, %s, 0, %s, %s, 'low', 'pending')
-            """, (image_url, placeholder_filename, width, height))
-            cache_id = cursor.lastrowid
-        
-        # Link the pin to the cached_images record
-        cursor.execute("""
-            UPDATE pins 
-            SET cached_image_id = %s 
-            WHERE id = %s AND cached_image_id IS NULL
-        """, (cache_id, pin_id))
+                UPDATE pins 
+                SET cached_image_id = %s 
+                WHERE id = %s AND cached_image_id IS NULL
+            """, (cache_id, pin_id))
         
-        db.commit()
         return True
         
     except Exception as e:
-        print(f"Error updating pin dimensions: {e}")
-        if db:
-            try:
-                db.rollback()
-            except Exception:
-                pass
+        logger.error(f"Error updating pin dimensions: {e}")
         return False
-    finally:
-        if cursor:
-            try:
-                cursor.close()
-            except Exception:
-                pass
-        if db:
-            try:
-                db.close()
-            except Exception:
-                pass
 
 # Database connection pool configuration
 dbconfig = {
@@ -430,41 +781,73 @@ dbconfig = {
     "password": os.getenv('DB_PASSWORD') or os.getenv('MYSQL_PASSWORD'),
     "database": os.getenv('DB_NAME', 'db'),
     "pool_name": "mypool",
-    "pool_size": 20,  # Increased from 10 to handle more concurrent requests
-    "pool_reset_session": True,  # Reset session state when returning connection to pool
+    # mysql.connector caps a single pool at 32 connections
+    "pool_size": min(int(os.getenv('DB_POOL_SIZE', '32')), pooling.CNX_POOL_MAXSIZE),
+    # Skip the COM_RESET_CONNECTION round trip on every checkout. Nothing sets
+    # session state; tx() uses START TRANSACTION rather than toggling autocommit.
+    "pool_reset_session": False,
     "autocommit": True,
     "charset": 'utf8mb4',
     "collation": 'utf8mb4_unicode_ci',
-    "connection_timeout": 5,  # Timeout for getting connection from pool
+    "connection_timeout": 5,  # TCP connect/auth timeout when the pool opens a connection
     "use_unicode": True
 }
 
+# Seconds get_db_connection() waits for a free pooled connection
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '3'))
+
 # Create connection pool
 try:
     cnxpool = mysql.connector.pooling.MySQLConnectionPool(**dbconfig)
-    print("Database connection pool created successfully")
+    logger.info("Database connection pool created successfully")
 except mysql.connector.Error as err:
-    print(f"Error creating connection pool: {err}")
+    logger.error(f"Error creating connection pool: {err}")
+    cnxpool = None
+_cnxpool_lock = threading.Lock()
+
+def _reset_pool_after_fork():
+    """
+    Forget the parent's pool in a forked worker (e.g. gunicorn --preload).
+    Its sockets are shared with the parent, so get_db_connection() builds a
+    fresh pool for this process on first use instead.
+    """
+    global cnxpool, _cnxpool_lock
     cnxpool = None
+    _cnxpool_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_pool_after_fork)
 
 def get_db_connection():
     """
     Get a database connection from the pool.
     Raises an exception if connection cannot be obtained.
     """
+    global cnxpool
     try:
-        if cnxpool:
+        if cnxpool is None:
+            # The database wasn't up at import time. Retry creating the pool
+            # rather than falling back to unpooled connections, which would
+            # exhaust max_connections under load.
+            with _cnxpool_lock:
+                if cnxpool is None:
+                    cnxpool = mysql.connector.pooling.MySQLConnectionPool(**dbconfig)
+        # get_connection() fails immediately when every connection is
+        # checked out, so wait briefly for one to be returned.
+        deadline = time.monotonic() + DB_POOL_TIMEOUT
+        delay = 0.01
+        while True:
             try:
                 return cnxpool.get_connection()
             except mysql.connector.pooling.PoolError as pool_err:
-                # Pool exhausted - log and re-raise with more context
-                print(f"Database connection pool exhausted: {pool_err}")
-                print(f"Pool size: {cnxpool.pool_size}, active connections may be leaked")
-                raise mysql.connector.Error(f"Database connection pool exhausted. Please try again in a moment.")
-        else:
-            return mysql.connector.connect(**dbconfig)
+                if time.monotonic() + delay > deadline:
+                    # Pool exhausted - log and re-raise with more context
+                    logger.error(f"Database connection pool exhausted: {pool_err}")
+                    logger.error(f"Pool size: {cnxpool.pool_size}, active connections may be leaked")
+                    raise mysql.connector.Error(f"Database connection pool exhausted. Please try again in a moment.")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.25)
     except mysql.connector.Error as err:
-        print(f"Error getting database connection: {err}")
+        logger.error(f"Error getting database connection: {err}")
         raise
 
 
@@ -472,9 +855,10 @@ def get_db_connection():
 def tx(dictionary=False):
     """
     Transactional context manager. The pool default is autocommit=True; this
-    helper explicitly disables autocommit for the duration of the block so all
-    statements run inside a single transaction that either commits as a whole
-    or rolls back on exception.
+    helper opens an explicit transaction for the block so all statements either
+    commit as a whole or roll back on exception. START TRANSACTION leaves the
+    session's autocommit flag alone, so there's nothing to flip back before the
+    connection returns to the pool.
 
     Usage:
         with tx() as (db, cursor):
@@ -484,9 +868,9 @@ def tx(dictionary=False):
     Pass dictionary=True for a dict cursor.
     """
     db = get_db_connection()
-    db.autocommit = False
     cursor = db.cursor(dictionary=dictionary, buffered=True)
     try:
+        db.start_transaction()
         yield db, cursor
         db.commit()
     except Exception:
@@ -501,15 +885,61 @@ def tx(dictionary=False):
         except Exception:
             pass
         try:
-            # Restore the pool default before returning the connection.
-            db.autocommit = True
+            db.close()
         except Exception:
             pass
+
+
+@contextmanager
+def db_cursor(dictionary=True):
+    """
+    Read-side counterpart to tx(): yields a buffered cursor on a pooled
+    connection (left in the pool's autocommit mode) and always releases the
+    cursor and connection, even if the block raises.
+
+    Usage:
+        with db_cursor() as cursor:
+            cursor.execute(...)
+    """
+    db = get_db_connection()
+    cursor = None
+    try:
+        cursor = db.cursor(dictionary=dictionary, buffered=True)
+        yield cursor
+    finally:
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception:
+                pass
         try:
             db.close()
         except Exception:
             pass
 
+def execute_statements(cursor, statements, params=()):
+    """
+    Run several write statements in a single round trip. Like
+    fetch_result_sets(), ``params`` is the flat tuple across all of them.
+    """
+    for _ in cursor.execute(";\n".join(statements), params, multi=True):
+        pass
+
+
+def fetch_result_sets(cursor, statements, params=()):
+    """
+    Run several SELECT statements in a single round trip and return their
+    rows as a list of result sets, in statement order.
+
+    The statements are joined into one multi-statement query; ``params`` is
+    the flat tuple of placeholders across all of them.
+    """
+    results = []
+    for result in cursor.execute(";\n".join(statements), params, multi=True):
+        if result.with_rows:
+            results.append(result.fetchall())
+    return results
+
 # ============================================================================
 # AUTHENTICATION FUNCTIONS
 # ============================================================================
@@ -707,8 +1137,9 @@ def _get_temp_image_link_ttl_seconds():
     return max(30, min(ttl, 900))
 
 
+@lru_cache(maxsize=1)
 def _temp_image_link_serializer():
-    """Build serializer for temporary public image links."""
+    """Serializer for temporary public image links, built once per process."""
     signing_secret = (
         os.getenv('TEMP_IMAGE_LINK_SECRET')
         or os.getenv('JWT_SECRET_KEY')
@@ -718,6 +1149,13 @@ def _temp_image_link_serializer():
     return URLSafeTimedSerializer(signing_secret, salt='scrappl-temp-image-link-v1')
 
 
+# Pooled session for proxying remote images, so repeat loads from the same
+# CDN reuse a kept-alive connection instead of a fresh TCP + TLS handshake.
+_IMAGE_PROXY_SESSION = requests.Session()
+_image_proxy_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+_IMAGE_PROXY_SESSION.mount('https://', _image_proxy_adapter)
+_IMAGE_PROXY_SESSION.mount('http://', _image_proxy_adapter)
+
 def _serve_image_url(image_url):
     """Serve an image URL by streaming local files or proxying remote images."""
     if not image_url:
@@ -738,27 +1176,29 @@ def _serve_image_url(image_url):
             return response
 
         if image_url.startswith('http://') or image_url.startswith('https://'):
-            response = requests.get(image_url, timeout=10, stream=True)
-            if response.status_code != 200:
-                return "Image unavailable", 502
-
-            content_type = (response.headers.get('Content-Type') or '').lower()
-            if not content_type.startswith('image/'):
-                return "Image URL did not return an image", 400
-
-            proxied = Response(
-                response.content,
-                status=200,
-                content_type=response.headers.get('Content-Type', 'image/jpeg')
-            )
-            proxied.headers['Cache-Control'] = 'no-store, max-age=0'
-            return proxied
+            # The with block hands the connection back to the shared pool on
+            # every return path, including the early error responses
+            with _IMAGE_PROXY_SESSION.get(image_url, timeout=10, stream=True) as response:
+                if response.status_code != 200:
+                    return "Image unavailable", 502
+
+                content_type = (response.headers.get('Content-Type') or '').lower()
+                if not content_type.startswith('image/'):
+                    return "Image URL did not return an image", 400
+
+                proxied = Response(
+                    response.content,
+                    status=200,
+                    content_type=response.headers.get('Content-Type', 'image/jpeg')
+                )
+                proxied.headers['Cache-Control'] = 'no-store, max-age=0'
+                return proxied
     except FileNotFoundError:
         return "Image not found", 404
     except requests.RequestException:
         return "Image unavailable", 502
     except Exception as e:
-        print(f"Error serving image URL '{image_url}': {e}")
+        logger.error(f"Error serving image URL '{image_url}': {e}")
         return "Image unavailable", 502
 
     return "Unsupported image URL", 400
@@ -783,6 +1223,22 @@ def set_session_cookie(response, token):
 # AUTHENTICATION ROUTES
 # ============================================================================
 
+# Created on first use when OTPs fall back to the database (no Redis)
+_CREATE_OTP_CODES_SQL = """
+    CREATE TABLE IF NOT EXISTS otp_codes (
+        email VARCHAR(255) NOT NULL,
+        otp VARCHAR(6) NOT NULL,
+        expires_at TIMESTAMP NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (email),
+        INDEX idx_otp_expires_at (expires_at)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+# Fire-and-forget mail (the welcome email) goes out on this pool so the login
+# request isn't held open for a Brevo API call whose result it doesn't use.
+_EMAIL_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='email')
+
 @app.route('/auth/login', methods=['GET', 'POST'])
 def login_page():
     """
@@ -800,46 +1256,26 @@ def login_page():
     if not email or '@' not in email:
         return jsonify({"error": "Valid email address is required"}), 400
     
-    db = None
-    cursor = None
-    
     try:
-        # Check if user exists, create if not
+        # Create the user if they don't exist yet, in one statement. Unlike
+        # INSERT IGNORE / ON DUPLICATE KEY this doesn't use up an
+        # AUTO_INCREMENT id on every returning user's login.
         try:
-            db = get_db_connection()
-            cursor = db.cursor(dictionary=True, buffered=True)
-            
-            cursor.execute("SELECT id FROM users WHERE email = %s", (email,))
-            user = cursor.fetchone()
-            
-            if not user:
-                # Create new user
-                cursor.execute(
-                    "INSERT INTO users (email, created_at) VALUES (%s, NOW())",
-                    (email,)
-                )
-                db.commit()
-                
-                # Send welcome email
-                send_welcome_email(email)
+            with db_cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO users (email, created_at)
+                    SELECT %s, NOW() FROM DUAL
+                    WHERE NOT EXISTS (SELECT 1 FROM users WHERE email = %s)
+                """, (email, email))
+                is_new_user = cursor.rowcount == 1
         except mysql.connector.Error as db_err:
-            print(f"Database error in login: {str(db_err)}")
+            logger.error(f"Database error in login: {str(db_err)}")
             return jsonify({"error": "Database temporarily unavailable. Please try again in a moment."}), 503
-        finally:
-            if cursor:
-                try:
-                    try:
-                        cursor.fetchall()
-                    except Exception:
-                        pass
-                    cursor.close()
-                except Exception:
-                    pass
-            if db:
-                try:
-                    db.close()
-                except Exception:
-                    pass
+        
+        if is_new_user:
+            # Send welcome email in the background; the OTP below is what the
+            # user is waiting for
+            _EMAIL_EXECUTOR.submit(send_welcome_email, email)
         
         if action == 'request':
             # Generate and send OTP
@@ -850,45 +1286,24 @@ def login_page():
                 store_otp(email, otp, redis_client)
             else:
                 # Store in database with expiration
-                db = get_db_connection()
-                cursor = db.cursor()
-                try:
-                    from auth_utils import OTP_EXPIRY
-                    from datetime import datetime, timedelta
-                    expires_at = datetime.utcnow() + timedelta(seconds=OTP_EXPIRY)
-                    cursor.execute(
-                        "INSERT INTO otp_codes (email, otp, expires_at) VALUES (%s, %s, %s) ON DUPLICATE KEY UPDATE otp = %s, expires_at = %s",
-                        (email, otp, expires_at, otp, expires_at)
-                    )
-                    db.commit()
-                except mysql.connector.Error as e:
-                    # Table might not exist, create it
-                    if e.errno == 1146:  # Table doesn't exist
-                        cursor.execute("""
-                            CREATE TABLE IF NOT EXISTS otp_codes (
-                                email VARCHAR(255) NOT NULL,
-                                otp VARCHAR(6) NOT NULL,
-                                expires_at TIMESTAMP NOT NULL,
-                                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                                PRIMARY KEY (email),
-                                INDEX idx_otp_expires_at (expires_at)
-                            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-                        """)
-                        db.commit()
-                        # Retry the insert
-                        from auth_utils import OTP_EXPIRY
-                        from datetime import datetime, timedelta
-                        expires_at = datetime.utcnow() + timedelta(seconds=OTP_EXPIRY)
+                expires_at = datetime.utcnow() + timedelta(seconds=OTP_EXPIRY)
+                with db_cursor(dictionary=False) as cursor:
+                    try:
                         cursor.execute(
                             "INSERT INTO otp_codes (email, otp, expires_at) VALUES (%s, %s, %s) ON DUPLICATE KEY UPDATE otp = %s, expires_at = %s",
                             (email, otp, expires_at, otp, expires_at)
                         )
-                        db.commit()
-                    else:
-                        raise
-                finally:
-                    cursor.close()
-                    db.close()
+                    except mysql.connector.Error as e:
+                        # Table might not exist, create it
+                        if e.errno == 1146:  # Table doesn't exist
+                            cursor.execute(_CREATE_OTP_CODES_SQL)
+                            # Retry the insert
+                            cursor.execute(
+                                "INSERT INTO otp_codes (email, otp, expires_at) VALUES (%s, %s, %s) ON DUPLICATE KEY UPDATE otp = %s, expires_at = %s",
+                                (email, otp, expires_at, otp, expires_at)
+                            )
+                        else:
+                            raise
             
             # Send OTP email
             if send_otp_email(email, otp):
@@ -913,68 +1328,37 @@ def login_page():
                 is_valid = verify_otp(email, otp, redis_client)
             else:
                 # Verify from database
-                db = get_db_connection()
-                cursor = db.cursor(dictionary=True)
-                try:
-                    cursor.execute(
-                        "SELECT otp FROM otp_codes WHERE email = %s AND expires_at > NOW()",
-                        (email,)
-                    )
-                    result = cursor.fetchone()
-                    if result and result['otp'] == otp:
-                        is_valid = True
-                        # Delete OTP after use
-                        cursor.execute("DELETE FROM otp_codes WHERE email = %s", (email,))
-                        db.commit()
-                except mysql.connector.Error as e:
-                    # Table might not exist
-                    if e.errno == 1146:  # Table doesn't exist
-                        cursor.execute("""
-                            CREATE TABLE IF NOT EXISTS otp_codes (
-                                email VARCHAR(255) NOT NULL,
-                                otp VARCHAR(6) NOT NULL,
-                                expires_at TIMESTAMP NOT NULL,
-                                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                                PRIMARY KEY (email),
-                                INDEX idx_otp_expires_at (expires_at)
-                            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-                        """)
-                        db.commit()
-                    else:
-                        raise
-                finally:
-                    cursor.close()
-                    db.close()
+                with db_cursor() as cursor:
+                    try:
+                        cursor.execute(
+                            "SELECT otp FROM otp_codes WHERE email = %s AND expires_at > NOW()",
+                            (email,)
+                        )
+                        result = cursor.fetchone()
+                        if result and result['otp'] == otp:
+                            is_valid = True
+                            # Delete OTP after use
+                            cursor.execute("DELETE FROM otp_codes WHERE email = %s", (email,))
+                    except mysql.connector.Error as e:
+                        # Table might not exist
+                        if e.errno == 1146:  # Table doesn't exist
+                            cursor.execute(_CREATE_OTP_CODES_SQL)
+                        else:
+                            raise
             
             if not is_valid:
                 return jsonify({"error": "Invalid or expired code. Please try again."}), 400
             
-            # OTP verified - create session
-            db = None
-            cursor = None
-            try:
-                db = get_db_connection()
-                cursor = db.cursor(dictionary=True, buffered=True)
-                cursor.execute("SELECT id, email FROM users WHERE email = %s", (email,))
-                user = cursor.fetchone()
-                
-                if not user:
-                    return jsonify({"error": "User not found"}), 404
-                
-                # Update last login
-                cursor.execute("UPDATE users SET last_login = NOW() WHERE id = %s", (user['id'],))
-                db.commit()
-            finally:
-                if cursor:
-                    try:
-                        cursor.close()
-                    except Exception:
-                        pass
-                if db:
-                    try:
-                        db.close()
-                    except Exception:
-                        pass
+            # OTP verified - record the login and load the user in one round trip
+            with db_cursor() as cursor:
+                (users,) = fetch_result_sets(cursor, [
+                    "UPDATE users SET last_login = NOW() WHERE email = %s",
+                    "SELECT id, email FROM users WHERE email = %s",
+                ], (email, email))
+            
+            if not users:
+                return jsonify({"error": "User not found"}), 404
+            user = users[0]
             
             # Generate session token
             session_token = generate_session_token(user['id'], user['email'])
@@ -993,19 +1377,7 @@ def login_page():
             return jsonify({"error": "Invalid action"}), 400
             
     except Exception as e:
-        print(f"Error in login: {str(e)}")
-        traceback.print_exc()
-        # Ensure cleanup on any error
-        if cursor:
-            try:
-                cursor.close()
-            except Exception:
-                pass
-        if db:
-            try:
-                db.close()
-            except Exception:
-                pass
+        logger.exception(f"Error in login: {str(e)}")
         return jsonify({"error": "An error occurred"}), 500
 
 @app.route('/auth/verify')
@@ -1033,97 +1405,150 @@ def health_check():
     """
     return jsonify({"status": "ok"}), 200
 
+# Results of the SHOW probes for optional schema, keyed by probe name.
+# docker-entrypoint.sh runs migrate.py before the app starts, so the schema
+# can't change under a running process and each probe only needs to run once.
+_schema_probes = {}
+
+def _schema_probe(cursor, name, query):
+    if name not in _schema_probes:
+        cursor.execute(query)
+        _schema_probes[name] = bool(cursor.fetchall())
+    return _schema_probes[name]
+
+BOARD_LIST_SQL = "SELECT id, name FROM boards WHERE user_id = %s ORDER BY name"
+
+def cached_user_boards(user_id):
+    """Return the cached board picker list for user_id, or None on a miss."""
+    if not redis_client:
+        return None
+    try:
+        cached = redis_client.get(BOARD_LIST_KEY.format(user_id=user_id))
+        if cached:
+            return orjson.loads(cached)
+    except Exception as e:
+        logger.error(f"Error reading board list from cache: {e}")
+    return None
+
+def store_user_boards(user_id, rows):
+    """Cache BOARD_LIST_SQL rows as the user's board picker list and return it."""
+    boards = [{'id': row['id'], 'name': row['name']} for row in rows]
+    if redis_client:
+        try:
+            redis_client.setex(BOARD_LIST_KEY.format(user_id=user_id), BOARD_LIST_TIMEOUT, orjson.dumps(boards))
+        except Exception as e:
+            logger.error(f"Error caching board list: {e}")
+    return boards
+
+def get_user_boards(cursor, user_id):
+    """
+    Return [{'id', 'name'}] for a user's boards ordered by name, from Redis
+    when possible (BOARD_LIST_KEY) and from the database otherwise. Views
+    that already batch queries append BOARD_LIST_SQL to their batch on a
+    miss instead (see board() and view_pin()).
+    """
+    boards = cached_user_boards(user_id)
+    if boards is None:
+        cursor.execute(BOARD_LIST_SQL, (user_id,))
+        boards = store_user_boards(user_id, cursor.fetchall())
+    return boards
+
+def has_cached_images_table(cursor):
+    """Whether the cached_images table exists (memoized per process)."""
+    return _schema_probe(cursor, 'cached_images', "SHOW TABLES LIKE 'cached_images'")
+
+def pins_have_cached_columns(cursor):
+    """Whether pins has the cached_image_id column (memoized per process)."""
+    return _schema_probe(cursor, 'pins.cached_image_id', "SHOW COLUMNS FROM pins LIKE 'cached_image_id'")
+
+def _pick_random_board_covers(cursor, user_id, boards):
+    """
+    Pick one random pin image for each board in a single round trip.
+    Returns {board_id: image_url}.
+
+    Each pick is an indexed OFFSET into the board's own pins, using the
+    pin_count the caller already has, rather than ORDER BY RAND() — which
+    makes MySQL materialize and sort every pin on the board.
+    """
+    if not boards:
+        return {}
+    parts = []
+    params = []
+    for board in boards:
+        parts.append("""
+            (SELECT board_id, image_url FROM pins
+             WHERE board_id = %s AND user_id = %s
+             ORDER BY id LIMIT 1 OFFSET %s)
+        """)
+        params.extend((board['id'], user_id, random.randint(0, board['pin_count'] - 1)))
+    cursor.execute(" UNION ALL ".join(parts), tuple(params))
+    return {row['board_id']: row['image_url'] for row in cursor.fetchall() if row['image_url']}
+
+def _save_board_covers(cursor, user_id, covers):
+    """
+    Persist {board_id: image_url} picks as board default images in a single
+    statement. Boards that got a default in the meantime are left alone.
+    """
+    cases = " ".join(["WHEN %s THEN %s"] * len(covers))
+    ids = ", ".join(["%s"] * len(covers))
+    params = [value for item in covers.items() for value in item]
+    params.append(user_id)
+    params.extend(covers)
+    cursor.execute(f"""
+        UPDATE boards
+        SET default_image_url = CASE id {cases} END
+        WHERE user_id = %s AND id IN ({ids}) AND default_image_url IS NULL
+    """, tuple(params))
+
 @app.route('/')
 @login_required
-@cache_view(timeout=300)  # Cache for 5 minutes
+@cache_view(timeout=GALLERY_CACHE_TIMEOUT, key=GALLERY_CACHE_KEY)
 def gallery():
     user = get_current_user()
-    db = None
-    cursor = None
     try:
-        try:
-            db = get_db_connection()
-            cursor = db.cursor(dictionary=True, buffered=True)
-        except mysql.connector.Error as db_err:
-            # Database unavailable - return user-friendly error
-            print(f"Database error in gallery: {str(db_err)}")
-            return render_template('auth_error.html', message="Database temporarily unavailable. Please try again in a moment."), 503
-        
-        # Get boards with pin count and image (user-scoped)
-        cursor.execute("""
-            SELECT 
-                b.*,
-                COUNT(p.id) as pin_count,
-                b.created_at
-            FROM boards b
-            LEFT JOIN pins p ON b.id = p.board_id AND p.user_id = %s
-            WHERE b.user_id = %s
-            GROUP BY b.id
-            ORDER BY b.name
-        """, (user['id'], user['id']))
-        boards = cursor.fetchall()
-        
-        # For each board, determine and save the display image
-        # Use buffered cursor to prevent "Unread result found" errors when executing multiple queries
-        for board in boards:
-            if board['default_image_url']:
-                # Use the custom default image
-                board['random_pin_image_url'] = board['default_image_url']
-            elif board['pin_count'] > 0:
-                # No default set, but has pins - select a random one and save it
+        with db_cursor() as cursor:
+            # Get boards with pin count and image (user-scoped). pin_count is
+            # maintained on boards by triggers on pins, so there's no aggregate.
+            cursor.execute("""
+                SELECT b.*
+                FROM boards b
+                WHERE b.user_id = %s
+                ORDER BY b.name
+            """, (user['id'],))
+            boards = cursor.fetchall()
+            
+            # Pick a random pin image for every board that doesn't have a cover yet
+            # in one round trip, instead of one ORDER BY RAND() query per board.
+            needs_cover = [b for b in boards if not b['default_image_url'] and b['pin_count'] > 0]
+            try:
+                covers = _pick_random_board_covers(cursor, user['id'], needs_cover)
+            except mysql.connector.Error as e:
+                logger.error(f"Error picking board covers in gallery: {str(e)}")
+                covers = {}
+
+            # For each board, determine the display image
+            for board in boards:
+                if board['default_image_url']:
+                    # Use the custom default image
+                    board['random_pin_image_url'] = board['default_image_url']
+                elif covers.get(board['id']):
+                    board['random_pin_image_url'] = covers[board['id']]
+                else:
+                    # No pins, use default image
+                    board['random_pin_image_url'] = '/static/images/default_board.png'
+
+            # Save the random picks as defaults so they don't change, in one
+            # UPDATE rather than one round trip per board
+            if covers:
                 try:
-                    cursor.execute("""
-                        SELECT image_url 
-                        FROM pins 
-                        WHERE board_id = %s AND user_id = %s
-                        ORDER BY RAND() 
-                        LIMIT 1
-                    """, (board['id'], user['id']))
-                    pin = cursor.fetchone()
-                    
-                    if pin and pin['image_url']:
-                        # Save this random selection as the default so it doesn't change
-                        cursor.execute("""
-                            UPDATE boards 
-                            SET default_image_url = %s 
-                            WHERE id = %s AND user_id = %s AND default_image_url IS NULL
-                        """, (pin['image_url'], board['id'], user['id']))
-                        db.commit()
-                        board['random_pin_image_url'] = pin['image_url']
-                    else:
-                        board['random_pin_image_url'] = '/static/images/default_board.png'
+                    _save_board_covers(cursor, user['id'], covers)
                 except mysql.connector.Error as e:
-                    # If there's an error in the loop, log it but continue
-                    print(f"Error processing board {board['id']} in gallery: {str(e)}")
-                    board['random_pin_image_url'] = '/static/images/default_board.png'
-            else:
-                # No pins, use default image
-                board['random_pin_image_url'] = '/static/images/default_board.png'
-                
-        # Invalidate gallery cache if Redis is available
-        if redis_client:
-            redis_client.delete(f"view:{user['id']}:/")
+                    logger.error(f"Error saving board covers in gallery: {str(e)}")
 
     except mysql.connector.Error as e:
-        print(f"Database error in gallery: {str(e)}")
-        traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            try:
-                # Ensure all results are consumed before closing
-                try:
-                    cursor.fetchall()
-                except Exception:
-                    pass
-                cursor.close()
-            except Exception as cursor_close_error:
-                print(f"gallery: error closing cursor: {cursor_close_error}")
-        if db:
-            try:
-                db.close()
-            except Exception as db_close_error:
-                print(f"gallery: error closing db connection: {db_close_error}")
+        # Database unavailable - return user-friendly error
+        logger.exception(f"Database error in gallery: {str(e)}")
+        return render_template('auth_error.html', message="Database temporarily unavailable. Please try again in a moment."), 503
 
     return render_template('boards.html', boards=boards)
 
@@ -1131,58 +1556,20 @@ def gallery():
 @login_required
 def board(board_id):
     user = get_current_user()
-    db = None
-    cursor = None
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True, buffered=True)
-        
-        # Get board details (user-scoped)
-        cursor.execute("SELECT * FROM boards WHERE id = %s AND user_id = %s", (board_id, user['id']))
-        board = cursor.fetchone()
-        if not board:
-            return "Board not found", 404
-            
-        # Get sections for this board with pin count
-        cursor.execute("""
-            SELECT s.*,
-                   COUNT(p.id) as pin_count
-            FROM sections s
-            LEFT JOIN pins p ON p.section_id = s.id
-                             AND p.board_id = s.board_id
-                             AND p.user_id = %s
-            WHERE s.board_id = %s
-            GROUP BY s.id
-            ORDER BY s.name
-        """, (user['id'], board_id))
-        sections = cursor.fetchall()
-        
-        # Check if this is a featured view (from search) - load all pins if so
-        is_featured = request.args.get('featured') or request.args.get('highlight')
-        
-        # Get total pin count for pagination
-        cursor.execute("""
-            SELECT COUNT(*) as total
-            FROM pins p
-            WHERE p.board_id = %s AND p.user_id = %s
-        """, (board_id, user['id']))
-        total_pins = cursor.fetchone()['total']
-        
-        # Determine initial limit: 1.5 screens (~30-45 pins) unless featured
-        if is_featured:
-            initial_limit = total_pins  # Load all if featured
-        else:
-            initial_limit = 40  # ~1.5 screens worth of pins
-        
-        # Get initial pins for this board (simplified - no dimension queries)
-        try:
-            # Check if cached_images table exists
-            cursor.execute("SHOW TABLES LIKE 'cached_images'")
-            result = cursor.fetchone()
-            cached_images_exists = result is not None
-            # Consume any remaining results
-            cursor.fetchall()
-            
+        with db_cursor() as cursor:
+            # Check if this is a featured view (from search) - load all pins if so
+            is_featured = request.args.get('featured') or request.args.get('highlight')
+
+            # Initial page: 1.5 screens (~30-45 pins) unless featured, which loads all
+            pins_limit = "" if is_featured else "LIMIT 40"
+
+            try:
+                cached_images_exists = has_cached_images_table(cursor)
+            except Exception as e:
+                logger.warning(f"Could not check cached_images table, using fallback query: {e}")
+                cached_images_exists = False
+
             if cached_images_exists:
                 # Include cached images data with dimensions for layout stability.
                 # IMPORTANT: join WITHOUT filtering on cache_status so we still get
@@ -1190,7 +1577,7 @@ def board(board_id):
                 # written by /save-pin-dimensions before the file finished caching.
                 # Then null out cached_filename for non-cached/placeholder rows so
                 # the template doesn't try to <img src> a missing file.
-                cursor.execute("""
+                pins_query = f"""
                     SELECT p.*, s.name as section_name,
                            CASE
                                WHEN ci.cache_status = 'cached'
@@ -1206,43 +1593,75 @@ def board(board_id):
                     LEFT JOIN cached_images ci ON p.cached_image_id = ci.id
                     WHERE p.board_id = %s AND p.user_id = %s
                     ORDER BY p.created_at DESC, p.id ASC
-                    LIMIT %s
-                """, (board_id, user['id'], initial_limit))
+                    {pins_limit}
+                """
             else:
                 # Fallback query without cached images
-                cursor.execute("""
-                    SELECT p.*, s.name as section_name, 
+                pins_query = f"""
+                    SELECT p.*, s.name as section_name,
                            NULL as cached_filename, NULL as cache_status
-                    FROM pins p 
-                    LEFT JOIN sections s ON p.section_id = s.id 
+                    FROM pins p
+                    LEFT JOIN sections s ON p.section_id = s.id
                     WHERE p.board_id = %s AND p.user_id = %s
                     ORDER BY p.created_at DESC, p.id ASC
-                    LIMIT %s
-                """, (board_id, user['id'], initial_limit))
-        except Exception as e:
-            # Fallback to basic query if there are any issues
-            print(f"Warning: Could not check cached_images table, using fallback query: {e}")
-            cursor.execute("""
-                SELECT p.*, s.name as section_name, 
-                       NULL as cached_filename, NULL as cache_status
-                FROM pins p 
-                LEFT JOIN sections s ON p.section_id = s.id 
-                WHERE p.board_id = %s AND p.user_id = %s
-                ORDER BY p.created_at DESC, p.id ASC
-                LIMIT %s
-            """, (board_id, user['id'], initial_limit))
-        pins = cursor.fetchall()
-        
-        # Get all boards for the move board functionality (user-scoped)
-        cursor.execute("SELECT * FROM boards WHERE user_id = %s ORDER BY name", (user['id'],))
-        all_boards = cursor.fetchall()
+                    {pins_limit}
+                """
+
+            # Board, sections, pin total, initial pins and (unless Redis has it)
+            # the move-board list all go to the server in one round trip
+            # (every statement is user-scoped).
+            all_boards = cached_user_boards(user['id'])
+            statements = [
+                "SELECT * FROM boards WHERE id = %s AND user_id = %s",
+                """
+                SELECT s.*,
+                       COUNT(p.id) as pin_count
+                FROM sections s
+                LEFT JOIN pins p ON p.section_id = s.id
+                                 AND p.board_id = s.board_id
+                                 AND p.user_id = %s
+                WHERE s.board_id = %s
+                GROUP BY s.id
+                ORDER BY s.name
+                """,
+                "SELECT COUNT(*) as total FROM pins p WHERE p.board_id = %s AND p.user_id = %s",
+                pins_query,
+            ]
+            params = [
+                board_id, user['id'],
+                user['id'], board_id,
+                board_id, user['id'],
+                board_id, user['id'],
+            ]
+            if all_boards is None:
+                statements.append(BOARD_LIST_SQL)
+                params.append(user['id'])
+            results = fetch_result_sets(cursor, statements, tuple(params))
+            board_rows, sections, total_rows, pins = results[:4]
+            if all_boards is None:
+                all_boards = store_user_boards(user['id'], results[4])
+        if not board_rows:
+            return "Board not found", 404
+        board = board_rows[0]
+        total_pins = total_rows[0]['total']
         
         # Pass environment info to template
         flask_env = os.getenv('FLASK_ENV', 'production')
         is_development = flask_env in ['development', 'debug']
         
+        if not is_development:
+            # Enable browser caching in production for faster subsequent loads
+            # Use ETag based on board_id + user_id + board updated_at timestamp + total pins
+            board_updated = board.get('updated_at') or board.get('created_at') or ''
+            etag_data = f"{board_id}_{user['id']}_{board_updated}_{total_pins}"
+            etag = hashlib.md5(etag_data.encode()).hexdigest()
+            
+            # Check if client has a matching ETag (304 Not Modified) before
+            # spending time rendering the page
+            if request.headers.get('If-None-Match') == etag:
+                return Response(status=304)
+        
         # Create response with appropriate caching headers
-        from flask import make_response, Response
         response = make_response(render_template('board.html', board=board, sections=sections, pins=pins, all_boards=all_boards, is_development=is_development, total_pin_count=total_pins, is_featured=is_featured))
         
         if is_development:
@@ -1251,41 +1670,50 @@ def board(board_id):
             response.headers['Pragma'] = 'no-cache'
             response.headers['Expires'] = '0'
         else:
-            # Enable browser caching in production for faster subsequent loads
-            # Use ETag based on board_id + user_id + board updated_at timestamp + total pins
-            board_updated = board.get('updated_at') or board.get('created_at') or ''
-            etag_data = f"{board_id}_{user['id']}_{board_updated}_{total_pins}"
-            etag = hashlib.md5(etag_data.encode()).hexdigest()
-            
-            # Check if client has a matching ETag (304 Not Modified)
-            if request.headers.get('If-None-Match') == etag:
-                return Response(status=304)
-            
             response.headers['ETag'] = etag
             response.headers['Cache-Control'] = 'private, max-age=300'  # Cache for 5 minutes
             response.headers['Vary'] = 'Cookie'  # Vary by user session
         
         return response
     except Exception as e:
-        print(f"Error in board route: {str(e)}")
-        traceback.print_exc()
+        logger.exception(f"Error in board route: {str(e)}")
         return "An error occurred", 500
-    finally:
-        if cursor:
-            try:
-                # Ensure all results are consumed before closing
-                try:
-                    cursor.fetchall()
-                except Exception:
-                    pass
-                cursor.close()
-            except Exception as cursor_close_error:
-                print(f"board: error closing cursor: {cursor_close_error}")
-        if db:
-            try:
-                db.close()
-            except Exception as db_close_error:
-                print(f"board: error closing db connection: {db_close_error}")
+
+# Words in a search query; InnoDB only indexes words of 3+ characters
+_SEARCH_WORD_RE = re.compile(r'\w+')
+
+# InnoDB's default FULLTEXT stopwords; they are never indexed, so requiring
+# one in BOOLEAN MODE would make the whole MATCH come back empty
+_SEARCH_STOPWORDS = frozenset({
+    'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de', 'en',
+    'for', 'from', 'how', 'i', 'in', 'is', 'it', 'la', 'of', 'on', 'or',
+    'that', 'the', 'this', 'to', 'was', 'what', 'when', 'where', 'who',
+    'will', 'with', 'und', 'www',
+})
+
+def _pin_search_filter(cursor, query, user_id):
+    """
+    Return a (WHERE fragment, params) pair matching the user's pins for the
+    query. Uses the ft_pins_title_desc FULLTEXT index (every non-stopword as a
+    required word prefix) when all words are long enough to be indexed and it
+    finds at least one pin; otherwise falls back to a LIKE substring scan, so a
+    query with no word-prefix match still finds substrings.
+    """
+    search_term = f"%{query}%"
+    like_filter = ("(p.title LIKE %s OR p.description LIKE %s)", (search_term, search_term))
+    words = [word for word in _SEARCH_WORD_RE.findall(query)
+             if word.lower() not in _SEARCH_STOPWORDS]
+    if not words or any(len(word) < 3 for word in words):
+        return like_filter
+    terms = ' '.join(f'+{word}*' for word in words)
+    fulltext_filter = ("MATCH(p.title, p.description) AGAINST (%s IN BOOLEAN MODE)", (terms,))
+    cursor.execute(
+        f"SELECT 1 FROM pins p WHERE {fulltext_filter[0]} AND p.user_id = %s LIMIT 1",
+        (terms, user_id)
+    )
+    if not cursor.fetchall():
+        return like_filter
+    return fulltext_filter
 
 @app.route('/search', methods=['GET'])
 @login_required
@@ -1295,102 +1723,69 @@ def search():
     if not query:
         return render_template('search.html', matching_boards=[], matching_pins=[], query=query, total_pin_count=0, total_board_count=0)
 
-    # Initialize variables to prevent NameError if exception occurs
-    matching_boards = []
-    matching_pins = []
-    total_count = 0
-    total_board_count = 0
-    
-    db = None
-    cursor = None
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True, buffered=True)
-        
         search_term = f"%{query}%"
-        
-        # Optimized: Get total board count first (for pagination)
-        board_count_sql = """
-            SELECT COUNT(*) as total
-            FROM boards b
-            WHERE b.name LIKE %s AND b.user_id = %s
-        """
-        cursor.execute(board_count_sql, (search_term, user['id']))
-        total_board_count = cursor.fetchone()['total']
-        
-        # Optimized: Get boards with their first pin image, limit to first 10 for initial load
-        board_sql = """
-            SELECT b.*, 
-                   (SELECT p.image_url FROM pins p 
-                    WHERE p.board_id = b.id AND p.user_id = %s 
-                    LIMIT 1) as random_pin_image_url
-            FROM boards b
-            WHERE b.name LIKE %s AND b.user_id = %s
-            ORDER BY b.created_at DESC
-            LIMIT 10
-        """
-        cursor.execute(board_sql, (user['id'], search_term, user['id']))
-        matching_boards = cursor.fetchall()
-        
+
+        # Board and pin counts (for pagination) plus the first 10 of each for
+        # the initial load, in one round trip.
+        with db_cursor() as cursor:
+            pin_filter, pin_params = _pin_search_filter(cursor, query, user['id'])
+            board_totals, matching_boards, pin_totals, matching_pins = fetch_result_sets(cursor, [
+                """
+                SELECT COUNT(*) as total
+                FROM boards b
+                WHERE b.name LIKE %s AND b.user_id = %s
+                """,
+                """
+                SELECT b.*,
+                       COALESCE(b.default_image_url,
+                                (SELECT p.image_url FROM pins p
+                                 WHERE p.board_id = b.id AND p.user_id = %s
+                                 LIMIT 1)) as random_pin_image_url
+                FROM boards b
+                WHERE b.name LIKE %s AND b.user_id = %s
+                ORDER BY b.created_at DESC
+                LIMIT 10
+                """,
+                f"""
+                SELECT COUNT(*) as total
+                FROM pins p
+                WHERE {pin_filter} AND p.user_id = %s
+                """,
+                f"""
+                SELECT p.*, b.name as board_name, s.name as section_name,
+                       ci.cached_filename, ci.cache_status,
+                       ci.width as cached_width, ci.height as cached_height
+                FROM pins p
+                LEFT JOIN boards b ON p.board_id = b.id
+                LEFT JOIN sections s ON p.section_id = s.id
+                LEFT JOIN cached_images ci ON p.cached_image_id = ci.id AND ci.cache_status = 'cached'
+                WHERE {pin_filter} AND p.user_id = %s
+                ORDER BY p.created_at DESC
+                LIMIT 10
+                """,
+            ], (
+                search_term, user['id'],
+                user['id'], search_term, user['id'],
+                *pin_params, user['id'],
+                *pin_params, user['id'],
+            ))
+        total_board_count = board_totals[0]['total']
+        total_count = pin_totals[0]['total']
+
         # Set default image for boards without pins
         for board in matching_boards:
             if not board['random_pin_image_url']:
                 board['random_pin_image_url'] = 'path/to/default_image.jpg'
 
-        # Optimized: Get total pin count first (for pagination)
-        count_sql = """
-            SELECT COUNT(*) as total
-            FROM pins p 
-            WHERE (p.title LIKE %s OR p.description LIKE %s) AND p.user_id = %s
-        """
-        cursor.execute(count_sql, (search_term, search_term, user['id']))
-        total_count = cursor.fetchone()['total']
-        
-        # Optimized: Single query with all joins, limit to first 10 pins for initial load
-        pin_sql = """
-            SELECT p.*, b.name as board_name, s.name as section_name,
-                   ci.cached_filename, ci.cache_status,
-                   ci.width as cached_width, ci.height as cached_height
-            FROM pins p
-            LEFT JOIN boards b ON p.board_id = b.id 
-            LEFT JOIN sections s ON p.section_id = s.id
-            LEFT JOIN cached_images ci ON p.cached_image_id = ci.id AND ci.cache_status = 'cached'
-            WHERE (p.title LIKE %s OR p.description LIKE %s) AND p.user_id = %s
-            ORDER BY p.created_at DESC
-            LIMIT 10
-        """
-        
-        cursor.execute(pin_sql, (search_term, search_term, user['id']))
-        matching_pins = cursor.fetchall()
-        
-        # REMOVED: Blocking dimension calculation - let the background processor handle it
-        
     except mysql.connector.Error as e:
-        print(f"Database error in search: {str(e)}")
+        logger.error(f"Database error in search: {str(e)}")
         # Return empty results instead of JSON error for better UX
         return render_template('search.html', matching_boards=[], matching_pins=[], query=query, total_pin_count=0, total_board_count=0)
     except Exception as e:
-        print(f"Error in search route: {str(e)}")
-        # Log the full traceback for debugging
-        print(traceback.format_exc())
+        logger.exception(f"Error in search route: {str(e)}")
         # Return empty results instead of crashing
         return render_template('search.html', matching_boards=[], matching_pins=[], query=query, total_pin_count=0, total_board_count=0)
-    finally:
-        if cursor:
-            try:
-                # Ensure all results are consumed before closing
-                try:
-                    cursor.fetchall()
-                except Exception:
-                    pass
-                cursor.close()
-            except Exception as cursor_close_error:
-                print(f"search: error closing cursor: {cursor_close_error}")
-        if db:
-            try:
-                db.close()
-            except Exception as db_close_error:
-                print(f"search: error closing db connection: {db_close_error}")
 
     return render_template('search.html', matching_boards=matching_boards, matching_pins=matching_pins, query=query, total_pin_count=total_count, total_board_count=total_board_count)
 
@@ -1406,30 +1801,25 @@ def search_pins_api():
     if not query:
         return jsonify({"success": False, "error": "Query parameter required"}), 400
     
-    db = None
-    cursor = None
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True, buffered=True)
-        
-        search_term = f"%{query}%"
-        
-        # Optimized: Single query with all joins, with pagination
-        pin_sql = """
-            SELECT p.*, b.name as board_name, s.name as section_name,
-                   ci.cached_filename, ci.cache_status,
-                   ci.width as cached_width, ci.height as cached_height
-            FROM pins p
-            LEFT JOIN boards b ON p.board_id = b.id 
-            LEFT JOIN sections s ON p.section_id = s.id
-            LEFT JOIN cached_images ci ON p.cached_image_id = ci.id AND ci.cache_status = 'cached'
-            WHERE (p.title LIKE %s OR p.description LIKE %s) AND p.user_id = %s
-            ORDER BY p.created_at DESC
-            LIMIT %s OFFSET %s
-        """
-        
-        cursor.execute(pin_sql, (search_term, search_term, user['id'], limit, offset))
-        matching_pins = cursor.fetchall()
+        with db_cursor() as cursor:
+            pin_filter, pin_params = _pin_search_filter(cursor, query, user['id'])
+
+            # Optimized: Single query with all joins, with pagination
+            pin_sql = f"""
+                SELECT p.*, b.name as board_name, s.name as section_name,
+                       ci.cached_filename, ci.cache_status,
+                       ci.width as cached_width, ci.height as cached_height
+                FROM pins p
+                LEFT JOIN boards b ON p.board_id = b.id 
+                LEFT JOIN sections s ON p.section_id = s.id
+                LEFT JOIN cached_images ci ON p.cached_image_id = ci.id AND ci.cache_status = 'cached'
+                WHERE {pin_filter} AND p.user_id = %s
+                ORDER BY p.created_at DESC
+                LIMIT %s OFFSET %s
+            """
+            cursor.execute(pin_sql, (*pin_params, user['id'], limit, offset))
+            matching_pins = cursor.fetchall()
         
         return jsonify({
             "success": True,
@@ -1438,28 +1828,11 @@ def search_pins_api():
         })
         
     except mysql.connector.Error as e:
-        print(f"Database error in search_pins_api: {str(e)}")
+        logger.error(f"Database error in search_pins_api: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
     except Exception as e:
-        print(f"Error in search_pins_api: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception(f"Error in search_pins_api: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
-    finally:
-        if cursor:
-            try:
-                # Ensure all results are consumed before closing
-                try:
-                    cursor.fetchall()
-                except Exception:
-                    pass
-                cursor.close()
-            except Exception as cursor_close_error:
-                print(f"search_pins_api: error closing cursor: {cursor_close_error}")
-        if db:
-            try:
-                db.close()
-            except Exception as db_close_error:
-                print(f"search_pins_api: error closing db connection: {db_close_error}")
 
 @app.route('/api/search/boards', methods=['GET'])
 @login_required
@@ -1473,28 +1846,26 @@ def search_boards_api():
     if not query:
         return jsonify({"success": False, "error": "Query parameter required"}), 400
     
-    db = None
-    cursor = None
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True, buffered=True)
-        
         search_term = f"%{query}%"
         
-        # Optimized: Get boards with their first pin image, with pagination
+        # Boards with their cover (the saved default, else their first pin
+        # image), with pagination
         board_sql = """
-            SELECT b.*, 
-                   (SELECT p.image_url FROM pins p 
-                    WHERE p.board_id = b.id AND p.user_id = %s 
-                    LIMIT 1) as random_pin_image_url
+            SELECT b.*,
+                   COALESCE(b.default_image_url,
+                            (SELECT p.image_url FROM pins p
+                             WHERE p.board_id = b.id AND p.user_id = %s
+                             LIMIT 1)) as random_pin_image_url
             FROM boards b
             WHERE b.name LIKE %s AND b.user_id = %s
             ORDER BY b.created_at DESC
             LIMIT %s OFFSET %s
         """
         
-        cursor.execute(board_sql, (user['id'], search_term, user['id'], limit, offset))
-        matching_boards = cursor.fetchall()
+        with db_cursor() as cursor:
+            cursor.execute(board_sql, (user['id'], search_term, user['id'], limit, offset))
+            matching_boards = cursor.fetchall()
         
         # Set default image for boards without pins
         for board in matching_boards:
@@ -1508,58 +1879,58 @@ def search_boards_api():
         })
         
     except mysql.connector.Error as e:
-        print(f"Database error in search_boards_api: {str(e)}")
+        logger.error(f"Database error in search_boards_api: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
     except Exception as e:
-        print(f"Error in search_boards_api: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception(f"Error in search_boards_api: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
-    finally:
-        if cursor:
-            try:
-                # Ensure all results are consumed before closing
-                try:
-                    cursor.fetchall()
-                except Exception:
-                    pass
-                cursor.close()
-            except Exception as cursor_close_error:
-                print(f"search_boards_api: error closing cursor: {cursor_close_error}")
-        if db:
-            try:
-                db.close()
-            except Exception as db_close_error:
-                print(f"search_boards_api: error closing db connection: {db_close_error}")
 
 @app.route('/add-content')
 @login_required
 def add_content():
     user = get_current_user()
-    db = None
-    cursor = None
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM boards WHERE user_id = %s", (user['id'],))
-        boards = cursor.fetchall()
+        with db_cursor() as cursor:
+            boards = get_user_boards(cursor, user['id'])
         return render_template('add_content.html', boards=boards)
     except mysql.connector.Error as e:
-        print(f"Database error in add_content: {e}")
+        logger.error(f"Database error in add_content: {e}")
         return jsonify({"error": str(e)}), 500
     except Exception as e:
-        print(f"Unexpected error in add_content: {e}")
+        logger.error(f"Unexpected error in add_content: {e}")
         return jsonify({"error": "An unexpected error occurred"}), 500
-    finally:
-        if cursor:
-            try:
-                cursor.close()
-            except Exception:
-                pass
-        if db:
-            try:
-                db.close()
-            except Exception:
-                pass
+
+# Upper bound on how much of a page /scrape-website downloads and parses
+SCRAPE_MAX_BYTES = 5 * 1024 * 1024
+
+# Content types worth parsing for images; anything else is skipped unread.
+# A missing Content-Type is still parsed.
+_SCRAPE_MARKUP_TYPES = ('html', 'xml')
+
+# Every element /scrape-website pulls images from, gathered in one tree walk
+_SCRAPE_IMAGE_XPATH = lxml.etree.XPath(
+    '//img | //meta[@property="og:image" or @property="twitter:image"]'
+)
+
+# Browser-like headers so sites serve /scrape-website their normal markup
+_SCRAPE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+}
+
+# Shared session so repeat scrapes of the same host reuse pooled connections
+# instead of paying a new TCP + TLS handshake each time.
+_SCRAPE_SESSION = requests.Session()
+_SCRAPE_SESSION.headers.update(_SCRAPE_HEADERS)
+_scrape_adapter = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.2),
+)
+_SCRAPE_SESSION.mount('https://', _scrape_adapter)
+_SCRAPE_SESSION.mount('http://', _scrape_adapter)
 
 @app.route('/scrape-website', methods=['POST'])
 @login_required
@@ -1571,85 +1942,81 @@ def scrape_website():
         return jsonify({"error": "Valid URL is required"}), 400
     
     try:
-        # Add proper headers to mimic a browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
         images = []
         seen_urls = set()  # To avoid duplicates
         
-        # Look for img tags with src or data-src (for lazy loading)
-        for img in soup.find_all('img'):
-            src = img.get('src') or img.get('data-src')
-            if src:
-                # Convert relative URLs to absolute and sanitize
-                absolute_url = sanitize_url(urljoin(url, src))
-                if absolute_url and absolute_url not in seen_urls:
+        # Stream the page and stop reading at SCRAPE_MAX_BYTES so a huge page
+        # can't balloon memory; libxml2 sniffs the encoding from the raw bytes.
+        # Images, PDFs and other downloads have no tags to scrape, so their
+        # bodies aren't read at all.
+        with _SCRAPE_SESSION.get(url, timeout=(3, 10), stream=True) as response:
+            content_type = response.headers.get('Content-Type', '').lower()
+            if content_type and not any(t in content_type for t in _SCRAPE_MARKUP_TYPES):
+                return jsonify({'images': images})
+            content = response.raw.read(SCRAPE_MAX_BYTES, decode_content=True)
+        
+        try:
+            tree = lxml.html.fromstring(content)
+        except ParserError:
+            # Empty or unparseable document
+            return jsonify({'images': images})
+        
+        # One pass over img tags (src or data-src for lazy loading) and the
+        # og:image / twitter:image meta tags. Meta images are listed after
+        # the page's own images, and repeated raw values (spacers, icons)
+        # skip the urljoin + sanitize work.
+        meta_images = []
+        seen_src = set()
+        for el in _SCRAPE_IMAGE_XPATH(tree):
+            if el.tag == 'img':
+                src = el.get('src') or el.get('data-src')
+            else:
+                src = el.get('content')
+            if not src or src in seen_src:
+                continue
+            seen_src.add(src)
+            # Convert relative URLs to absolute and sanitize
+            absolute_url = sanitize_url(urljoin(url, src))
+            if not absolute_url:
+                continue
+            if el.tag == 'img':
+                if absolute_url not in seen_urls:
                     seen_urls.add(absolute_url)
                     images.append({
                         'url': absolute_url,
-                        'alt': sanitize_string(img.get('alt', ''), max_length=200)
+                        'alt': sanitize_alt(el.get('alt', ''))
                     })
-        
-        # Also look for meta tags with og:image or twitter:image
-        for meta in soup.find_all('meta'):
-            if meta.get('property') in ['og:image', 'twitter:image']:
-                image_url = meta.get('content')
-                if image_url:
-                    absolute_url = sanitize_url(urljoin(url, image_url))
-                    if absolute_url and absolute_url not in seen_urls:
-                        seen_urls.add(absolute_url)
-                        images.append({
-                            'url': absolute_url,
-                            'alt': 'Social media preview image'
-                        })
+            else:
+                meta_images.append(absolute_url)
+        for absolute_url in meta_images:
+            if absolute_url not in seen_urls:
+                seen_urls.add(absolute_url)
+                images.append({
+                    'url': absolute_url,
+                    'alt': 'Social media preview image'
+                })
         
         return jsonify({'images': images})
     except Exception as e:
-        print(f"Error scraping website: {str(e)}")  # Add logging
+        logger.error(f"Error scraping website: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/get-sections/<int:board_id>')
 @login_required
 def get_sections(board_id):
     user = get_current_user()
-    db = None
-    cursor = None
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True, buffered=True)
-        # Verify board belongs to user, then get sections
-        cursor.execute("SELECT id FROM boards WHERE id = %s AND user_id = %s", (board_id, user['id']))
-        if not cursor.fetchone():
-            return jsonify({"error": "Board not found"}), 404
-        cursor.execute("SELECT * FROM sections WHERE board_id = %s", (board_id,))
-        sections = cursor.fetchall()
+        with db_cursor() as cursor:
+            # Ownership check and sections in one round trip
+            owned, sections = fetch_result_sets(cursor, [
+                "SELECT 1 FROM boards WHERE id = %s AND user_id = %s",
+                "SELECT * FROM sections WHERE board_id = %s",
+            ], (board_id, user['id'], board_id))
+            if not owned:
+                return jsonify({"error": "Board not found"}), 404
     except mysql.connector.Error as e:
-        print(f"Database error in get_board_sections: {str(e)}")
+        logger.error(f"Database error in get_board_sections: {str(e)}")
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            try:
-                # Ensure all results are consumed before closing
-                try:
-                    cursor.fetchall()
-                except Exception:
-                    pass
-                cursor.close()
-            except Exception as cursor_close_error:
-                print(f"get_board_sections: error closing cursor: {cursor_close_error}")
-        if db:
-            try:
-                db.close()
-            except Exception as db_close_error:
-                print(f"get_board_sections: error closing db connection: {db_close_error}")
     
     return jsonify(sections)
 
@@ -1664,12 +2031,14 @@ def save_pasted_image(data_url):
         header, encoded = data_url.split(',', 1)
         format_info = header.split(';')[0].split('/')[1]  # e.g., 'png', 'jpeg'
         
-        # Decode the base64 data
-        image_data = base64.b64decode(encoded)
+        # Decode the base64 data. a2b_base64 reads the ASCII str in place;
+        # base64.b64decode would first copy the whole payload into bytes.
+        image_data = binascii.a2b_base64(encoded)
         
-        # Generate a hash-based filename similar to the existing system
-        hash_obj = hashlib.md5(image_data)
-        filename_hash = hash_obj.hexdigest()[:16]  # Use first 16 chars like existing files
+        # Generate a hash-based filename similar to the existing system. The
+        # hash only names the file, so use BLAKE2b (much faster than MD5 on
+        # multi-MB pastes) with an 8-byte digest: 16 hex chars like existing files
+        filename_hash = hashlib.blake2b(image_data, digest_size=8).hexdigest()
         
         # Use the original format for the extension
         if format_info == 'jpeg':
@@ -1681,29 +2050,27 @@ def save_pasted_image(data_url):
         os.makedirs(cache_dir, exist_ok=True)
         filepath = os.path.join(cache_dir, filename)
         
-        # Write the image data to file
-        with open(filepath, 'wb') as f:
-            f.write(image_data)
+        # Write the image data to file. The name is a hash of the bytes, so an
+        # existing file already holds this image; 'x' makes that check atomic.
+        try:
+            with open(filepath, 'xb') as f:
+                f.write(image_data)
+        except FileExistsError:
+            pass
         
-        # Create a cached image record in the database
-        db = None
-        cursor = None
-        try:
-            db = get_db_connection()
-            cursor = db.cursor()
-            
-            # Check if cached_images table exists
-            cursor.execute("SHOW TABLES LIKE 'cached_images'")
-            result = cursor.fetchone()
-            # Consume any remaining results
-            cursor.fetchall()
-            if result:
+        # Create a cached image record in the database, or reuse the one from
+        # an earlier paste of the same image (unique on original_url + quality)
+        with db_cursor(dictionary=False) as cursor:
+            if has_cached_images_table(cursor):
                 # Insert into cached_images table
                 cursor.execute("""
                     INSERT INTO cached_images (
                         original_url, cached_filename, file_size, 
                         quality_level, cache_status, created_at, last_accessed
                     ) VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                    ON DUPLICATE KEY UPDATE
+                        id = LAST_INSERT_ID(id),
+                        last_accessed = CURRENT_TIMESTAMP
                 """, (
                     f"pasted_image_{filename_hash}",  # Use hash as original_url for pasted images
                     filename,
@@ -1713,20 +2080,8 @@ def save_pasted_image(data_url):
                 ))
                 
                 cached_image_id = cursor.lastrowid
-                db.commit()
             else:
                 cached_image_id = None
-        finally:
-            if cursor:
-                try:
-                    cursor.close()
-                except Exception:
-                    pass
-            if db:
-                try:
-                    db.close()
-                except Exception:
-                    pass
         
         # Return the relative path to the cached image
         return f"/cached/{filename}", cached_image_id
@@ -1734,6 +2089,23 @@ def save_pasted_image(data_url):
     except Exception as e:
         return None, None
 
+# Runs _after_pin_created so add_pin can answer as soon as the pin is committed
+_PIN_SIDE_EFFECT_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix='pin-created')
+
+def _after_pin_created(pin_id, image_url, board_id):
+    """Record placeholder dimensions for a new pin and queue its image for caching."""
+    try:
+        update_pin_dimensions(pin_id, image_url)
+    except Exception as e:
+        logger.error(f"Error calculating dimensions for new pin {pin_id}: {e}")
+
+    if image_url.startswith('http'):
+        try:
+            cache_service = _get_cache_service()
+            cache_service.queue_image_for_caching(pin_id, image_url, 'low', board_id)
+        except Exception as e:
+            logger.error(f"Failed to queue image for caching: {e}")
+
 @app.route('/add-pin', methods=['POST'])
 @login_required
 @require_csrf
@@ -1744,9 +2116,9 @@ def add_pin():
 
         board_id = sanitize_integer(data.get('board_id'))
         section_id = sanitize_integer(data.get('section_id'))
-        title = sanitize_string(data.get('title', ''), max_length=255)
-        description = sanitize_string(data.get('description', ''))
-        notes = sanitize_string(data.get('notes', ''))
+        title = sanitize_title(data.get('title', ''))
+        description = sanitize_text(data.get('description', ''))
+        notes = sanitize_text(data.get('notes', ''))
         raw_image_url = data.get('image_url', '')
         source_url = sanitize_url(data.get('source_url', ''))
         cached_image_id = None
@@ -1778,12 +2150,7 @@ def add_pin():
                 if not cursor.fetchone():
                     return jsonify({"error": "Section not found or belongs to a different board"}), 400
 
-            cursor.execute("SHOW COLUMNS FROM pins LIKE 'cached_image_id'")
-            result = cursor.fetchone()
-            has_cached_columns = result is not None
-            cursor.fetchall()
-
-            if has_cached_columns and cached_image_id:
+            if cached_image_id and pins_have_cached_columns(cursor):
                 cursor.execute("""
                     INSERT INTO pins (board_id, section_id, title, description, notes, image_url, link, cached_image_id, uses_cached_image, user_id)
                     VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
@@ -1814,24 +2181,31 @@ def add_pin():
                          metadata={'route': request.path},
                          ip_address=request.remote_addr)
 
-        # Post-commit side effects (best-effort, do not roll back the pin if these fail)
-        try:
-            update_pin_dimensions(pin_id, image_url)
-        except Exception as e:
-            print(f"Error calculating dimensions for new pin {pin_id}: {e}")
+        invalidate_pin_caches(user['id'])
 
-        if image_url.startswith('http'):
-            try:
-                cache_service = _get_cache_service()
-                cache_service.queue_image_for_caching(pin_id, image_url, 'low', board_id)
-            except Exception as e:
-                print(f"Failed to queue image for caching: {e}")
+        # Post-commit side effects run off the request thread (best-effort, do
+        # not roll back the pin if these fail)
+        _PIN_SIDE_EFFECT_EXECUTOR.submit(_after_pin_created, pin_id, image_url, board_id)
 
         return jsonify({'success': True, 'pin_id': pin_id})
     except Exception as e:
-        print(f"Error adding pin: {str(e)}")
+        logger.error(f"Error adding pin: {str(e)}")
         return jsonify({"error": "Failed to add pin"}), 500
 
+# Editable pin fields, in the column order used by the UPDATE statements below
+_UPDATE_PIN_FIELDS = ('title', 'description', 'notes', 'link')
+
+# One fixed UPDATE per non-empty subset of _UPDATE_PIN_FIELDS, so update_pin
+# only ever sends these 15 statement texts instead of building one per call.
+_UPDATE_PIN_STMTS = {
+    frozenset(fields): (
+        f"UPDATE pins SET {', '.join(f'{field} = %s' for field in fields)} "
+        "WHERE id = %s AND user_id = %s"
+    )
+    for size in range(1, len(_UPDATE_PIN_FIELDS) + 1)
+    for fields in itertools.combinations(_UPDATE_PIN_FIELDS, size)
+}
+
 @app.route('/update-pin/<int:pin_id>', methods=['POST'])
 @login_required
 @require_csrf
@@ -1843,58 +2217,48 @@ def update_pin(pin_id):
         return jsonify({"error": "No data provided"}), 400
         
     # Get only the fields that are provided
-    title = sanitize_string(data.get('title', ''), max_length=255) if 'title' in data else None
-    description = sanitize_string(data.get('description', '')) if 'description' in data else None
-    notes = sanitize_string(data.get('notes', '')) if 'notes' in data else None
+    title = sanitize_title(data.get('title', '')) if 'title' in data else None
+    description = sanitize_text(data.get('description', '')) if 'description' in data else None
+    notes = sanitize_text(data.get('notes', '')) if 'notes' in data else None
     link = sanitize_url(data.get('link', '')) if 'link' in data else None
     
+    new_values = {'title': title, 'description': description, 'notes': notes, 'link': link}
+    fields = [field for field in _UPDATE_PIN_FIELDS if new_values[field] is not None]
+    if not fields:
+        return jsonify({"error": "No fields to update"}), 400
     
     try:
         with tx(dictionary=True) as (db, cursor):
+            # Still read the current values first: the audit log records them
             cursor.execute(
-                "SELECT title, description, notes, link FROM pins WHERE id = %s AND user_id = %s",
+                "SELECT title, description, notes, link, board_id FROM pins WHERE id = %s AND user_id = %s",
                 (pin_id, user['id']),
             )
             current = cursor.fetchone()
             if not current:
                 return jsonify({"error": "Pin not found"}), 404
 
-            update_fields = []
-            update_values = []
-            before_changes = {}
-            after_changes = {}
-
-            if title is not None:
-                update_fields.append("title = %s"); update_values.append(title)
-                before_changes['title'] = current['title']; after_changes['title'] = title
-            if description is not None:
-                update_fields.append("description = %s"); update_values.append(description)
-                before_changes['description'] = current['description']; after_changes['description'] = description
-            if notes is not None:
-                update_fields.append("notes = %s"); update_values.append(notes)
-                before_changes['notes'] = current['notes']; after_changes['notes'] = notes
-            if link is not None:
-                update_fields.append("link = %s"); update_values.append(link)
-                before_changes['link'] = current['link']; after_changes['link'] = link
-
-            if not update_fields:
-                return jsonify({"error": "No fields to update"}), 400
-
-            update_values.append(pin_id)
-            update_values.append(user['id'])
+            before_changes = {field: current[field] for field in fields}
+            after_changes = {field: new_values[field] for field in fields}
 
             cursor.execute(
-                f"UPDATE pins SET {', '.join(update_fields)} WHERE id = %s AND user_id = %s",
-                tuple(update_values),
+                _UPDATE_PIN_STMTS[frozenset(fields)],
+                tuple(new_values[field] for field in fields) + (pin_id, user['id']),
             )
 
-            if link is not None:
+            if link:
+                # Reset the pin's health row for the new link in one statement
+                cursor.execute("""
+                    INSERT INTO url_health (pin_id, url, status, last_checked, archive_url)
+                    VALUES (%s, %s, 'unknown', NULL, NULL)
+                    ON DUPLICATE KEY UPDATE
+                    url = VALUES(url),
+                    status = 'unknown',
+                    last_checked = NULL,
+                    archive_url = NULL
+                """, (pin_id, link))
+            elif link is not None:
                 cursor.execute("DELETE FROM url_health WHERE pin_id = %s", (pin_id,))
-                if link:
-                    cursor.execute("""
-                        INSERT INTO url_health (pin_id, url, status, last_checked)
-                        VALUES (%s, %s, 'unknown', NULL)
-                    """, (pin_id, link))
 
             record_audit(cursor, action='pin.update', entity_type='pin',
                          entity_id=pin_id, user_id=user['id'],
@@ -1903,103 +2267,74 @@ def update_pin(pin_id):
                          metadata={'route': request.path},
                          ip_address=request.remote_addr)
 
+        if link:
+            # The new link is due for a check straight away
+            invalidate_cache([URL_HEALTH_IDLE_KEY.format(board_id=current['board_id'])])
         return jsonify({'success': True, 'pin_id': pin_id})
     except mysql.connector.Error as e:
-        print(f"Database error updating pin: {str(e)}")
+        logger.error(f"Database error updating pin: {str(e)}")
         return jsonify({"error": "Database error occurred"}), 500
     except Exception as e:
-        print(f"Error updating pin: {str(e)}")
+        logger.error(f"Error updating pin: {str(e)}")
         return jsonify({"error": "Failed to update pin"}), 500
 
 @app.route('/pin/<int:pin_id>')
 @login_required
 def view_pin(pin_id):
     user = get_current_user()
-    db = None
-    cursor = None
     try:
-        print(f"view_pin: start pin_id={pin_id}, user_id={user['id']}")
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True, buffered=True)
-
-        # Get pin details with board and section names (user-scoped)
-        cursor.execute("""
-            SELECT p.*, b.name as board_name, s.name as section_name,
-                   uh.status as link_status, uh.archive_url,
-                   CASE
-                       WHEN ci.cache_status = 'cached'
-                        AND ci.cached_filename IS NOT NULL
-                        AND ci.cached_filename NOT LIKE '%%.placeholder'
-                       THEN ci.cached_filename
-                       ELSE NULL
-                   END AS cached_filename
-            FROM pins p
-            LEFT JOIN boards b ON p.board_id = b.id
-            LEFT JOIN sections s ON p.section_id = s.id
-            LEFT JOIN url_health uh ON p.id = uh.pin_id
-            LEFT JOIN cached_images ci ON p.cached_image_id = ci.id
-            WHERE p.id = %s AND p.user_id = %s
-        """, (pin_id, user['id']))
+        with db_cursor() as cursor:
+            # Pin details, the pin's board sections and (unless Redis has it)
+            # the board selector in one round trip (user-scoped; sections
+            # resolve the board via the pin).
+            boards = cached_user_boards(user['id'])
+            statements = [
+                """
+                SELECT p.*, b.name as board_name, s.name as section_name,
+                       uh.status as link_status, uh.archive_url,
+                       CASE
+                           WHEN ci.cache_status = 'cached'
+                            AND ci.cached_filename IS NOT NULL
+                            AND ci.cached_filename NOT LIKE '%%.placeholder'
+                           THEN ci.cached_filename
+                           ELSE NULL
+                       END AS cached_filename
+                FROM pins p
+                LEFT JOIN boards b ON p.board_id = b.id
+                LEFT JOIN sections s ON p.section_id = s.id
+                LEFT JOIN url_health uh ON p.id = uh.pin_id
+                LEFT JOIN cached_images ci ON p.cached_image_id = ci.id
+                WHERE p.id = %s AND p.user_id = %s
+                """,
+                """
+                SELECT * FROM sections
+                WHERE board_id = (SELECT board_id FROM pins WHERE id = %s AND user_id = %s)
+                ORDER BY name
+                """,
+            ]
+            params = [pin_id, user['id'], pin_id, user['id']]
+            if boards is None:
+                statements.append(BOARD_LIST_SQL)
+                params.append(user['id'])
+            results = fetch_result_sets(cursor, statements, tuple(params))
+            pin_rows, sections = results[:2]
+            if boards is None:
+                boards = store_user_boards(user['id'], results[2])
 
-        pin = cursor.fetchone()
-        print(f"view_pin: fetched pin record? {'yes' if pin else 'no'}")
+        pin = pin_rows[0] if pin_rows else None
 
         if not pin:
-            print(f"view_pin: pin {pin_id} not found for user {user['id']}")
-            # Ensure cursor is fully consumed before closing
-            try:
-                cursor.fetchall()  # Consume any remaining results
-            except Exception:
-                pass
+            logger.info(f"view_pin: pin {pin_id} not found for user {user['id']}")
             return "Pin not found", 404
 
-        # Get all boards for the board selector (user-scoped)
-        cursor.execute("SELECT * FROM boards WHERE user_id = %s ORDER BY name", (user['id'],))
-        boards = cursor.fetchall()
-        print(f"view_pin: boards fetched count={len(boards)}")
-
-        # Get all sections for the current board
-        cursor.execute("SELECT * FROM sections WHERE board_id = %s ORDER BY name", (pin['board_id'],))
-        sections = cursor.fetchall()
-        print(f"view_pin: sections fetched count={len(sections)}")
-
         return render_template('pin.html', pin=pin, boards=boards, sections=sections)
     except mysql.connector.errors.InterfaceError as e:
-        # Handle "Unread result found" errors specifically
-        if "Unread result found" in str(e):
-            print(f"Unread result found error in view_pin, attempting to recover: {str(e)}")
-            # Try to consume any remaining results
-            if cursor:
-                try:
-                    cursor.fetchall()
-                except Exception:
-                    pass
-            # Return error but don't crash
-            return "An error occurred while loading the pin. Please try again.", 500
-        else:
-            print(f"Database interface error in view_pin route: {str(e)}")
-            traceback.print_exc()
-            return "An error occurred", 500
+        # db_cursor() has already closed the cursor and returned the connection
+        logger.exception(f"Database interface error in view_pin route: {str(e)}")
+        return "An error occurred while loading the pin. Please try again.", 500
     except Exception as e:
-        print(f"Error in view_pin route: {str(e)}")
-        traceback.print_exc()
+        logger.exception(f"Error in view_pin route: {str(e)}")
         return "An error occurred", 500
-    finally:
-        if cursor:
-            try:
-                # Ensure all results are consumed before closing
-                try:
-                    cursor.fetchall()
-                except Exception:
-                    pass
-                cursor.close()
-            except Exception as cursor_close_error:
-                print(f"view_pin: error closing cursor: {cursor_close_error}")
-        if db:
-            try:
-                db.close()
-            except Exception as db_close_error:
-                print(f"view_pin: error closing db connection: {db_close_error}")
 
 
 @app.route('/api/pin/<int:pin_id>/google-lens-url')
@@ -2007,16 +2342,13 @@ def view_pin(pin_id):
 def get_google_lens_url(pin_id):
     """Generate a Google Lens URL using a short-lived signed public image link."""
     user = get_current_user()
-    db = None
-    cursor = None
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True, buffered=True)
-        cursor.execute(
-            "SELECT image_url FROM pins WHERE id = %s AND user_id = %s",
-            (pin_id, user['id'])
-        )
-        pin = cursor.fetchone()
+        with db_cursor() as cursor:
+            cursor.execute(
+                "SELECT image_url FROM pins WHERE id = %s AND user_id = %s",
+                (pin_id, user['id'])
+            )
+            pin = cursor.fetchone()
         if not pin or not pin.get('image_url'):
             return jsonify({"error": "Pin image not found"}), 404
 
@@ -2031,19 +2363,8 @@ def get_google_lens_url(pin_id):
             "expires_in_seconds": _get_temp_image_link_ttl_seconds()
         })
     except Exception as e:
-        print(f"Error generating Google Lens URL for pin {pin_id}: {e}")
+        logger.error(f"Error generating Google Lens URL for pin {pin_id}: {e}")
         return jsonify({"error": "Failed to generate Google search link"}), 500
-    finally:
-        if cursor:
-            try:
-                cursor.close()
-            except Exception:
-                pass
-        if db:
-            try:
-                db.close()
-            except Exception:
-                pass
 
 
 @app.route('/public/pin-image/<token>')
@@ -2063,30 +2384,16 @@ def serve_temp_public_pin_image(token):
     if not pin_id:
         return "Invalid image link", 404
 
-    db = None
-    cursor = None
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True, buffered=True)
-        cursor.execute("SELECT image_url FROM pins WHERE id = %s", (pin_id,))
-        pin = cursor.fetchone()
+        with db_cursor() as cursor:
+            cursor.execute("SELECT image_url FROM pins WHERE id = %s", (pin_id,))
+            pin = cursor.fetchone()
         if not pin:
             return "Image not found", 404
         return _serve_image_url(pin.get('image_url'))
     except Exception as e:
-        print(f"Error serving temporary image link for pin {pin_id}: {e}")
+        logger.error(f"Error serving temporary image link for pin {pin_id}: {e}")
         return "Image unavailable", 502
-    finally:
-        if cursor:
-            try:
-                cursor.close()
-            except Exception:
-                pass
-        if db:
-            try:
-                db.close()
-            except Exception:
-                pass
 
 @app.route('/create-board', methods=['POST'])
 @login_required
@@ -2098,13 +2405,13 @@ def create_board():
         if data is None:
             return jsonify({"error": "Invalid JSON data"}), 400
             
-        board_name = sanitize_string(data.get('name', ''), max_length=100)
+        board_name = sanitize_name(data.get('name', ''))
         
         if not board_name:
             return jsonify({"error": "Board name is required"}), 400
         
         try:
-            slug = re.sub(r'[^a-z0-9]+', '-', board_name.lower()).strip('-')
+            slug = _SLUG_RE.sub('-', board_name.lower()).strip('-')
 
             with tx() as (db, cursor):
                 cursor.execute("SELECT id FROM boards WHERE name = %s AND user_id = %s",
@@ -2125,8 +2432,7 @@ def create_board():
                              metadata={'route': request.path},
                              ip_address=request.remote_addr)
 
-            if redis_client:
-                redis_client.delete(f"view:{user['id']}:/")
+            invalidate_gallery(user['id'])
             return jsonify({
                 'success': True,
                 'board_id': board_id,
@@ -2135,11 +2441,11 @@ def create_board():
             })
 
         except mysql.connector.Error as db_error:
-            print(f"Database error in create_board: {str(db_error)}")
+            logger.error(f"Database error in create_board: {str(db_error)}")
             return jsonify({"error": "Database error occurred"}), 500
 
     except Exception as e:
-        print(f"Error in create_board: {str(e)}")
+        logger.error(f"Error in create_board: {str(e)}")
         return jsonify({"error": "Server error occurred"}), 500
 
 @app.route('/move-pin/<int:pin_id>', methods=['POST'])
@@ -2159,34 +2465,39 @@ def move_pin(pin_id):
     
     try:
         with tx(dictionary=True) as (db, cursor):
-            cursor.execute("SELECT id, board_id, section_id FROM pins WHERE id = %s AND user_id = %s",
-                           (pin_id, user['id']))
+            # Pin's current placement (for the audit log) and the target board
+            # ownership check in one round trip
+            cursor.execute("""
+                SELECT p.board_id, p.section_id,
+                       EXISTS(SELECT 1 FROM boards b WHERE b.id = %s AND b.user_id = %s) AS target_ok
+                FROM pins p
+                WHERE p.id = %s AND p.user_id = %s
+            """, (board_id, user['id'], pin_id, user['id']))
             pin_before = cursor.fetchone()
             if not pin_before:
                 return jsonify({"error": "Pin not found"}), 404
-
-            cursor.execute("SELECT id FROM boards WHERE id = %s AND user_id = %s",
-                           (board_id, user['id']))
-            if not cursor.fetchone():
+            if not pin_before['target_ok']:
                 return jsonify({"error": "Target board not found"}), 404
 
-            cursor.execute("""
+            # The move and its audit row go out in one round trip
+            execute_statements(cursor, [
+                """
                 UPDATE pins
                 SET board_id = %s, section_id = NULL
                 WHERE id = %s AND user_id = %s
-            """, (board_id, pin_id, user['id']))
-
-            record_audit(cursor, action='pin.move', entity_type='pin',
-                         entity_id=pin_id, user_id=user['id'],
-                         actor_email=user.get('email'),
-                         before={'board_id': pin_before['board_id'],
-                                 'section_id': pin_before['section_id']},
-                         after={'board_id': board_id, 'section_id': None},
-                         metadata={'route': request.path},
-                         ip_address=request.remote_addr)
+                """,
+                AUDIT_INSERT_SQL,
+            ], (board_id, pin_id, user['id']) + audit_params(
+                action='pin.move', entity_type='pin',
+                entity_id=pin_id, user_id=user['id'],
+                actor_email=user.get('email'),
+                before={'board_id': pin_before['board_id'],
+                        'section_id': pin_before['section_id']},
+                after={'board_id': board_id, 'section_id': None},
+                metadata={'route': request.path},
+                ip_address=request.remote_addr))
 
-        if redis_client:
-            redis_client.delete(f"view:{user['id']}:/")
+        invalidate_gallery(user['id'])
         return jsonify({'success': True})
     except mysql.connector.Error as e:
         return jsonify({"error": str(e)}), 500
@@ -2205,15 +2516,15 @@ def create_section():
             return jsonify({"error": "Board ID and section name are required"}), 400
 
         with tx() as (db, cursor):
-            cursor.execute("SELECT id FROM boards WHERE id = %s AND user_id = %s",
-                           (board_id, user['id']))
-            if not cursor.fetchone():
-                return jsonify({"error": "Board not found"}), 404
-
+            # Inserting from boards doubles as the ownership check: no row
+            # goes in unless the user owns the board
             cursor.execute("""
                 INSERT INTO sections (board_id, name, user_id)
-                VALUES (%s, %s, %s)
-            """, (board_id, name, user['id']))
+                SELECT id, %s, user_id FROM boards
+                WHERE id = %s AND user_id = %s
+            """, (name, board_id, user['id']))
+            if cursor.rowcount != 1:
+                return jsonify({"error": "Board not found"}), 404
             section_id = cursor.lastrowid
 
             record_audit(cursor, action='section.create', entity_type='section',
@@ -2232,7 +2543,7 @@ def create_section():
             },
         })
     except Exception as e:
-        print(f"Error creating section: {str(e)}")
+        logger.error(f"Error creating section: {str(e)}")
         return jsonify({"error": "Failed to create section"}), 500
 
 @app.route('/update-section/<int:section_id>', methods=['POST'])
@@ -2258,21 +2569,24 @@ def update_section(section_id):
                 return jsonify({"error": "Section not found"}), 404
             old_name = row['name']
 
-            cursor.execute("UPDATE sections SET name = %s WHERE id = %s", (name, section_id))
-
-            record_audit(cursor, action='section.rename', entity_type='section',
-                         entity_id=section_id, user_id=user['id'],
-                         actor_email=user.get('email'),
-                         before={'name': old_name}, after={'name': name},
-                         metadata={'route': request.path},
-                         ip_address=request.remote_addr)
+            # The rename and its audit row in one round trip
+            execute_statements(cursor, [
+                "UPDATE sections SET name = %s WHERE id = %s",
+                AUDIT_INSERT_SQL,
+            ], (name, section_id) + audit_params(
+                action='section.rename', entity_type='section',
+                entity_id=section_id, user_id=user['id'],
+                actor_email=user.get('email'),
+                before={'name': old_name}, after={'name': name},
+                metadata={'route': request.path},
+                ip_address=request.remote_addr))
 
         return jsonify({
             'success': True,
             'section': {'id': section_id, 'name': name},
         })
     except Exception as e:
-        print(f"Error updating section: {str(e)}")
+        logger.error(f"Error updating section: {str(e)}")
         return jsonify({"error": "Failed to update section"}), 500
 
 @app.route('/delete-section/<int:section_id>', methods=['POST'])
@@ -2296,18 +2610,20 @@ def delete_section(section_id):
             # via ON DELETE SET NULL, but the snapshot lets us re-link them on undo).
             before = snapshot_section(cursor, section_id)
 
-            cursor.execute("DELETE FROM sections WHERE id = %s", (section_id,))
-
-            record_audit(cursor, action='section.delete', entity_type='section',
-                         entity_id=section_id, user_id=user['id'],
-                         actor_email=user.get('email'),
-                         before=before, after=None,
-                         metadata={'route': request.path, 'board_id': board_id},
-                         ip_address=request.remote_addr)
+            execute_statements(cursor, [
+                "DELETE FROM sections WHERE id = %s",
+                AUDIT_INSERT_SQL,
+            ], (section_id,) + audit_params(
+                action='section.delete', entity_type='section',
+                entity_id=section_id, user_id=user['id'],
+                actor_email=user.get('email'),
+                before=before, after=None,
+                metadata={'route': request.path, 'board_id': board_id},
+                ip_address=request.remote_addr))
 
         return jsonify({'success': True, 'board_id': board_id})
     except Exception as e:
-        print(f"Error deleting section: {str(e)}")
+        logger.error(f"Error deleting section: {str(e)}")
         return jsonify({"error": "Failed to delete section"}), 500
 
 @app.route('/move-pin-to-section/<int:pin_id>', methods=['POST'])
@@ -2322,19 +2638,23 @@ def move_pin_to_section(pin_id):
             section_id = None
 
         with tx(dictionary=True) as (db, cursor):
-            cursor.execute("SELECT board_id, section_id FROM pins WHERE id = %s AND user_id = %s",
-                           (pin_id, user['id']))
+            # Pin's board and current section (for the audit log) plus the
+            # target section check in one round trip
+            cursor.execute("""
+                SELECT p.board_id, p.section_id,
+                       EXISTS(SELECT 1 FROM sections s
+                              WHERE s.id = %s AND s.board_id = p.board_id) AS target_ok
+                FROM pins p
+                WHERE p.id = %s AND p.user_id = %s
+            """, (section_id, pin_id, user['id']))
             result = cursor.fetchone()
             if not result:
                 return jsonify({"error": "Pin not found"}), 404
             board_id = result['board_id']
             old_section_id = result['section_id']
 
-            if section_id:
-                cursor.execute("SELECT id FROM sections WHERE id = %s AND board_id = %s",
-                               (section_id, board_id))
-                if not cursor.fetchone():
-                    return jsonify({"error": "Section not found or belongs to different board"}), 400
+            if section_id and not result['target_ok']:
+                return jsonify({"error": "Section not found or belongs to different board"}), 400
 
             cursor.execute("""
                 UPDATE pins SET section_id = %s WHERE id = %s AND user_id = %s
@@ -2354,7 +2674,7 @@ def move_pin_to_section(pin_id):
             'section_id': section_id,
         })
     except Exception as e:
-        print(f"Error moving pin to section: {str(e)}")
+        logger.error(f"Error moving pin to section: {str(e)}")
         return jsonify({"error": "Failed to move pin"}), 500
 
 @app.route('/rename-board/<int:board_id>', methods=['POST'])
@@ -2387,11 +2707,10 @@ def rename_board(board_id):
                          metadata={'route': request.path},
                          ip_address=request.remote_addr)
 
-        if redis_client:
-            redis_client.delete(f"view:{user['id']}:/")
+        invalidate_gallery(user['id'])
         return jsonify({"success": True})
     except Exception as e:
-        print(f"Error renaming board: {str(e)}")
+        logger.error(f"Error renaming board: {str(e)}")
         return jsonify({"error": "Failed to rename board"}), 500
 
 @app.route('/move-board/<int:board_id>', methods=['POST'])
@@ -2410,59 +2729,59 @@ def move_board(board_id):
             return jsonify({"error": "Cannot convert a board into a section of itself"}), 400
 
         with tx(dictionary=True) as (db, cursor):
-            cursor.execute("SELECT id, name FROM boards WHERE id = %s AND user_id = %s",
-                           (board_id, user['id']))
-            source_board = cursor.fetchone()
-            if not source_board:
-                return jsonify({"error": "Source board not found"}), 404
-            source_board_name = source_board['name']
-
-            cursor.execute("SELECT id FROM boards WHERE id = %s AND user_id = %s",
-                           (target_board_id, user['id']))
-            if not cursor.fetchone():
-                return jsonify({"error": "Target board not found"}), 404
-
+            # The undo snapshot doubles as the source board ownership check
             before = snapshot_board(cursor, board_id)
+            if not before or before['board']['user_id'] != user['id']:
+                return jsonify({"error": "Source board not found"}), 404
+            source_board_name = before['board']['name']
 
-            # Create a new section in the target board with the source board's name
+            # Create a new section in the target board with the source board's
+            # name. Selecting from boards makes this the target ownership check
+            # too: nothing is inserted unless the user owns the target.
             cursor.execute("""
                 INSERT INTO sections (board_id, name, user_id)
-                VALUES (%s, %s, %s)
-            """, (target_board_id, source_board_name, user['id']))
+                SELECT id, %s, user_id FROM boards
+                WHERE id = %s AND user_id = %s
+            """, (source_board_name, target_board_id, user['id']))
+            if cursor.rowcount != 1:
+                return jsonify({"error": "Target board not found"}), 404
             new_section_id = cursor.lastrowid
 
-            # Move all pins from source to target, assigning them to the new section
-            cursor.execute("""
+            # In one round trip: move all pins from source to target, assigning
+            # them to the new section; move any pre-existing sections (excluding
+            # the one we just inserted), user-scoped to avoid cross-tenant
+            # moves; drop the now-empty source board; and write the audit row.
+            execute_statements(cursor, [
+                """
                 UPDATE pins
                 SET board_id = %s, section_id = %s
                 WHERE board_id = %s AND user_id = %s
-            """, (target_board_id, new_section_id, board_id, user['id']))
-
-            # Move any pre-existing sections from source to target (excluding the
-            # one we just inserted), user-scoped to avoid cross-tenant moves.
-            cursor.execute("""
+                """,
+                """
                 UPDATE sections
                 SET board_id = %s
                 WHERE board_id = %s AND user_id = %s AND id != %s
-            """, (target_board_id, board_id, user['id'], new_section_id))
-
-            cursor.execute("DELETE FROM boards WHERE id = %s AND user_id = %s",
-                           (board_id, user['id']))
-
-            record_audit(cursor, action='board.move', entity_type='board',
-                         entity_id=board_id, user_id=user['id'],
-                         actor_email=user.get('email'),
-                         before=before,
-                         after={'target_board_id': target_board_id,
-                                'new_section_id': new_section_id},
-                         metadata={'route': request.path},
-                         ip_address=request.remote_addr)
+                """,
+                "DELETE FROM boards WHERE id = %s AND user_id = %s",
+                AUDIT_INSERT_SQL,
+            ], (
+                target_board_id, new_section_id, board_id, user['id'],
+                target_board_id, board_id, user['id'], new_section_id,
+                board_id, user['id'],
+            ) + audit_params(
+                action='board.move', entity_type='board',
+                entity_id=board_id, user_id=user['id'],
+                actor_email=user.get('email'),
+                before=before,
+                after={'target_board_id': target_board_id,
+                       'new_section_id': new_section_id},
+                metadata={'route': request.path},
+                ip_address=request.remote_addr))
 
-        if redis_client:
-            redis_client.delete(f"view:{user['id']}:/")
+        invalidate_gallery(user['id'])
         return jsonify({"success": True})
     except Exception as e:
-        print(f"Error moving board: {str(e)}")
+        logger.error(f"Error moving board: {str(e)}")
         return jsonify({"error": "Failed to move board"}), 500
 
 @app.route('/delete-board/<int:board_id>', methods=['POST'])
@@ -2472,33 +2791,32 @@ def delete_board(board_id):
     user = get_current_user()
     try:
         with tx() as (db, cursor):
-            cursor.execute("SELECT id FROM boards WHERE id = %s AND user_id = %s",
-                           (board_id, user['id']))
-            if not cursor.fetchone():
-                return jsonify({"error": "Board not found"}), 404
-
             # Snapshot before mutation so the audit row contains everything needed
-            # to undo the delete.
+            # to undo the delete; it also serves as the ownership check.
             before = snapshot_board(cursor, board_id)
+            if not before or before['board']['user_id'] != user['id']:
+                return jsonify({"error": "Board not found"}), 404
 
-            cursor.execute("DELETE FROM pins WHERE board_id = %s AND user_id = %s",
-                           (board_id, user['id']))
-            cursor.execute("DELETE FROM sections WHERE board_id = %s AND user_id = %s",
-                           (board_id, user['id']))
-            cursor.execute("DELETE FROM boards WHERE id = %s AND user_id = %s",
-                           (board_id, user['id']))
-
-            record_audit(cursor, action='board.delete', entity_type='board',
-                         entity_id=board_id, user_id=user['id'],
-                         actor_email=user.get('email'), before=before, after=None,
-                         metadata={'route': request.path},
-                         ip_address=request.remote_addr)
-
-        if redis_client:
-            redis_client.delete(f"view:{user['id']}:/")
+            # Pins and sections are deleted explicitly rather than left to
+            # ON DELETE CASCADE, so databases where migration Step 17 couldn't
+            # convert the foreign keys behave the same. Still one round trip,
+            # with the audit row riding along.
+            execute_statements(cursor, [
+                "DELETE FROM pins WHERE board_id = %s AND user_id = %s",
+                "DELETE FROM sections WHERE board_id = %s AND user_id = %s",
+                "DELETE FROM boards WHERE id = %s AND user_id = %s",
+                AUDIT_INSERT_SQL,
+            ], (board_id, user['id']) * 3 + audit_params(
+                action='board.delete', entity_type='board',
+                entity_id=board_id, user_id=user['id'],
+                actor_email=user.get('email'), before=before, after=None,
+                metadata={'route': request.path},
+                ip_address=request.remote_addr))
+
+        invalidate_pin_caches(user['id'])
         return jsonify({"success": True})
     except Exception as e:
-        print(f"Error deleting board: {str(e)}")
+        logger.error(f"Error deleting board: {str(e)}")
         return jsonify({"error": "Failed to delete board"}), 500
 
 @app.route('/set-board-image/<int:board_id>', methods=['POST'])
@@ -2537,12 +2855,11 @@ def set_board_image(board_id):
                          metadata={'route': request.path},
                          ip_address=request.remote_addr)
 
-        if redis_client:
-            redis_client.delete(f"view:{user['id']}:/")
+        invalidate_gallery(user['id'])
 
         return jsonify({"success": True, "message": "Board image updated successfully"})
     except Exception as e:
-        print(f"Error setting board image: {str(e)}")
+        logger.error(f"Error setting board image: {str(e)}")
         return jsonify({"error": "Failed to set board image"}), 500
 
 @app.route('/set-section-image/<int:section_id>', methods=['POST'])
@@ -2585,8 +2902,7 @@ def set_section_image(section_id):
                          metadata={'route': request.path, 'board_id': section['board_id']},
                          ip_address=request.remote_addr)
 
-        if redis_client:
-            redis_client.delete(f"view:{user['id']}:/")
+        invalidate_gallery(user['id'])
 
         return jsonify({
             "success": True,
@@ -2594,42 +2910,65 @@ def set_section_image(section_id):
             "board_id": section["board_id"],
         })
     except Exception as e:
-        print(f"Error setting section image: {str(e)}")
+        logger.error(f"Error setting section image: {str(e)}")
         return jsonify({"error": "Failed to set section cover"}), 500
 
-@app.route('/link-health')
-@login_required
-def link_health():
-    """Dashboard to monitor URL health checking activity"""
-    user = get_current_user()
-    try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        
-        # Get overall statistics
+# Per-user totals for the link health dashboard. Link checks write url_health
+# from several places (board checks, single-pin checks, archive lookups), so
+# rather than invalidating on each, the entry just expires quickly; pin adds
+# and deletes drop it via invalidate_pin_caches.
+LINK_HEALTH_STATS_KEY = 'link_health:{user_id}:stats'
+LINK_HEALTH_STATS_TIMEOUT = 60
+
+def get_link_health_stats(user_id):
+    """Return the link health dashboard totals for user_id, from Redis when possible."""
+    key = LINK_HEALTH_STATS_KEY.format(user_id=user_id)
+    if redis_client:
+        try:
+            cached = redis_client.get(key)
+            if cached:
+                return orjson.loads(cached)
+        except Exception as e:
+            logger.error(f"Error reading link health stats from cache: {e}")
+
+    with db_cursor() as cursor:
+        # url_health is keyed by pin_id, so the join is one row per pin and
+        # plain COUNTs give the same totals as COUNT(DISTINCT p.id)
         cursor.execute("""
             SELECT 
-                COUNT(DISTINCT p.id) as total_pins_with_links,
-                COUNT(DISTINCT CASE WHEN uh.status = 'live' THEN p.id END) as live_count,
-                COUNT(DISTINCT CASE WHEN uh.status = 'broken' THEN p.id END) as broken_count,
-                COUNT(DISTINCT CASE WHEN uh.status = 'archived' THEN p.id END) as archived_count,
-                COUNT(DISTINCT CASE WHEN uh.status = 'unknown' OR uh.status IS NULL THEN p.id END) as unknown_count,
-                COUNT(DISTINCT CASE WHEN uh.last_checked IS NOT NULL THEN p.id END) as checked_count
+                COUNT(*) as total_pins_with_links,
+                COUNT(CASE WHEN uh.status = 'live' THEN 1 END) as live_count,
+                COUNT(CASE WHEN uh.status = 'broken' THEN 1 END) as broken_count,
+                COUNT(CASE WHEN uh.status = 'archived' THEN 1 END) as archived_count,
+                COUNT(CASE WHEN uh.status = 'unknown' OR uh.status IS NULL THEN 1 END) as unknown_count,
+                COUNT(CASE WHEN uh.last_checked IS NOT NULL THEN 1 END) as checked_count
             FROM pins p
             LEFT JOIN url_health uh ON p.id = uh.pin_id
             WHERE p.user_id = %s AND p.link IS NOT NULL AND p.link != ''
-        """, (user['id'],))
+        """, (user_id,))
         stats = cursor.fetchone()
-        
-        cursor.close()
-        db.close()
+
+    if redis_client:
+        try:
+            redis_client.setex(key, LINK_HEALTH_STATS_TIMEOUT, orjson.dumps(stats))
+        except Exception as e:
+            logger.error(f"Error caching link health stats: {e}")
+    return stats
+
+@app.route('/link-health')
+@login_required
+def link_health():
+    """Dashboard to monitor URL health checking activity"""
+    user = get_current_user()
+    try:
+        stats = get_link_health_stats(user['id'])
         
         # Don't load all_links on initial page load for performance
         # It will be loaded via AJAX when the "All Links" tab is clicked
         return render_template('link_health.html', stats=stats)
         
     except Exception as e:
-        print(f"Error in link_health: {str(e)}")
+        logger.error(f"Error in link_health: {str(e)}")
         return "Error loading link health dashboard", 500
 
 @app.route('/api/link-health/recent')
@@ -2642,78 +2981,108 @@ def link_health_recent():
         # Cap the limit to reasonable values
         limit = min(max(limit, 1), 500)
         
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        
-        # Get recent checks
-        cursor.execute("""
-            SELECT 
-                p.id as pin_id,
-                p.title,
-                p.link,
-                b.name as board_name,
-                uh.status,
-                uh.last_checked,
-                uh.archive_url
-            FROM url_health uh
-            JOIN pins p ON uh.pin_id = p.id
-            JOIN boards b ON p.board_id = b.id
-            WHERE p.user_id = %s
-            ORDER BY uh.last_checked DESC
-            LIMIT %s
-        """, (user['id'], limit))
-        recent_checks = cursor.fetchall()
-        
-        cursor.close()
-        db.close()
-        
-        # Convert datetime objects to strings
-        for check in recent_checks:
-            if check['last_checked']:
-                check['last_checked'] = check['last_checked'].strftime('%Y-%m-%d %H:%M:%S')
+        with db_cursor() as cursor:
+            # Get recent checks
+            cursor.execute("""
+                SELECT 
+                    p.id as pin_id,
+                    p.title,
+                    p.link,
+                    b.name as board_name,
+                    uh.status,
+                    DATE_FORMAT(uh.last_checked, '%%Y-%%m-%%d %%H:%%i:%%s') as last_checked,
+                    uh.archive_url
+                FROM url_health uh
+                JOIN pins p ON uh.pin_id = p.id
+                JOIN boards b ON p.board_id = b.id
+                WHERE p.user_id = %s
+                ORDER BY uh.last_checked DESC
+                LIMIT %s
+            """, (user['id'], limit))
+            # last_checked comes back already formatted by DATE_FORMAT
+            recent_checks = cursor.fetchall()
         
         return jsonify({'success': True, 'recent_checks': recent_checks})
         
     except Exception as e:
-        print(f"Error in link_health_recent: {str(e)}")
+        logger.error(f"Error in link_health_recent: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def get_pin_id_bounds(cursor, user_id):
+    """
+    Return (min_id, max_id) of a user's pins, or None if they have none.
+    Cached in Redis until pins are added or deleted (PIN_ID_BOUNDS_TIMEOUT at
+    most), so /random normally learns the range without touching the DB.
+    """
+    key = PIN_ID_BOUNDS_KEY.format(user_id=user_id)
+    try:
+        cached = redis_client.get(key)
+        if cached:
+            low, high = cached.split(':')
+            return int(low), int(high)
+    except Exception as e:
+        logger.error(f"Error reading pin id bounds from cache: {e}")
+    cursor.execute("SELECT MIN(id) AS low, MAX(id) AS high FROM pins WHERE user_id = %s", (user_id,))
+    row = cursor.fetchone()
+    if not row or row['low'] is None:
+        return None
+    try:
+        redis_client.setex(key, PIN_ID_BOUNDS_TIMEOUT, f"{row['low']}:{row['high']}")
+    except Exception as e:
+        logger.error(f"Error caching pin id bounds: {e}")
+    return row['low'], row['high']
+
 @app.route('/random')
 @login_required
 def random_pin():
     user = get_current_user()
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        
-        # First get the total count of pins (user-scoped)
-        cursor.execute("SELECT COUNT(*) as count FROM pins WHERE user_id = %s", (user['id'],))
-        total_pins = cursor.fetchone()['count']
+        with db_cursor() as cursor:
+            bounds = get_pin_id_bounds(cursor, user['id']) if redis_client else None
+            if bounds:
+                # Id range came from Redis: a single PK seek from a random point
+                pick = random.randint(*bounds)
+                cursor.execute("""
+                    SELECT id FROM pins
+                    WHERE user_id = %s AND id >= %s
+                    ORDER BY id
+                    LIMIT 1
+                """, (user['id'], pick))
+                pin = cursor.fetchone()
+                if not pin:
+                    # Cached upper bound outlived a delete; look below instead
+                    cursor.execute("""
+                        SELECT id FROM pins
+                        WHERE user_id = %s AND id < %s
+                        ORDER BY id DESC
+                        LIMIT 1
+                    """, (user['id'], pick))
+                    pin = cursor.fetchone()
+            else:
+                # Pick a random point in the user's id range and take the first
+                # pin at or after it: two index seeks instead of COUNT(*) + an
+                # OFFSET scan. RAND() sits in the aggregate derived table so
+                # it's evaluated once.
+                cursor.execute("""
+                    SELECT p.id
+                    FROM pins p
+                    JOIN (
+                        SELECT MIN(id) + FLOOR(RAND() * (MAX(id) - MIN(id) + 1)) AS pick
+                        FROM pins
+                        WHERE user_id = %s
+                    ) r
+                    WHERE p.user_id = %s AND p.id >= r.pick
+                    ORDER BY p.id
+                    LIMIT 1
+                """, (user['id'], user['id']))
+                pin = cursor.fetchone()
         
-        if total_pins == 0:
+        if not pin:
             return "No pins found", 404
-            
-        # Get a random offset
-        random_offset = random.randint(0, total_pins - 1)
-        
-        # Get the random pin with a single efficient query (user-scoped)
-        cursor.execute("""
-            SELECT p.*, b.name as board_name, s.name as section_name
-            FROM pins p
-            LEFT JOIN boards b ON p.board_id = b.id
-            LEFT JOIN sections s ON p.section_id = s.id
-            WHERE p.user_id = %s
-            LIMIT 1 OFFSET %s
-        """, (user['id'], random_offset))
-        
-        pin = cursor.fetchone()
-        
-        cursor.close()
-        db.close()
         
         return redirect(url_for('view_pin', pin_id=pin['id']))
     except Exception as e:
-        print(f"Error in random pin route: {str(e)}")
+        logger.error(f"Error in random pin route: {str(e)}")
         return "An error occurred", 500
 
 @app.route('/static/<path:path>')
@@ -2756,7 +3125,7 @@ def _get_cache_service():
 @login_required
 def cache_images():
     """Trigger image caching for external images"""
-    global _image_cache_service, _image_caching_in_progress
+    global _image_caching_in_progress
     
     user = get_current_user()
     try:
@@ -2797,7 +3166,7 @@ def cache_images():
     except Exception as e:
         with _image_cache_lock:
             _image_caching_in_progress = False
-        print(f"Error starting image caching: {str(e)}")
+        logger.error(f"Error starting image caching: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 
@@ -2818,64 +3187,60 @@ def get_random_pins():
     limit = min(max(limit, 1), 200)
     offset = max(offset, 0)
 
-    db = None
-    cursor = None
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True, buffered=True)
-
-        # Home Pins view only shows pins with a real image URL (skip empties
-        # and the app's default placeholder asset).
-        has_image_sql = (
-            "p.image_url IS NOT NULL AND TRIM(p.image_url) != '' "
-            "AND p.image_url NOT LIKE '%%default_pin%%'"
-        )
+        with db_cursor() as cursor:
+            # Home Pins view only shows pins with a real image URL (skip empties
+            # and the app's default placeholder asset).
+            has_image_sql = (
+                "p.image_url IS NOT NULL AND TRIM(p.image_url) != '' "
+                "AND p.image_url NOT LIKE '%%default_pin%%'"
+            )
 
-        cursor.execute(
-            f"SELECT COUNT(*) as count FROM pins p WHERE p.user_id = %s AND {has_image_sql}",
-            (user['id'],),
-        )
-        total = cursor.fetchone()['count']
-
-        query = f"""
-            SELECT p.*, s.name as section_name, b.name as board_name,
-                   CASE
-                       WHEN ci.cache_status = 'cached'
-                        AND ci.cached_filename IS NOT NULL
-                        AND ci.cached_filename NOT LIKE '%%.placeholder'
-                       THEN ci.cached_filename
-                       ELSE NULL
-                   END AS cached_filename,
-                   ci.cache_status,
-                   ci.width as cached_width, ci.height as cached_height
-            FROM pins p
-            LEFT JOIN sections s ON p.section_id = s.id
-            LEFT JOIN boards b ON p.board_id = b.id
-            LEFT JOIN cached_images ci ON p.cached_image_id = ci.id
-            WHERE p.user_id = %s AND {has_image_sql}
-            ORDER BY CRC32(CONCAT(p.id, '-', %s)), p.id
-            LIMIT %s OFFSET %s
-        """
-        params = (user['id'], str(seed), limit, offset)
+            cursor.execute(
+                f"SELECT COUNT(*) as count FROM pins p WHERE p.user_id = %s AND {has_image_sql}",
+                (user['id'],),
+            )
+            total = cursor.fetchone()['count']
 
-        try:
-            cursor.execute(query, params)
-        except Exception as query_err:
-            print(f"Random pins query error, retrying without cached_images join: {query_err}")
-            fallback_query = f"""
+            query = f"""
                 SELECT p.*, s.name as section_name, b.name as board_name,
-                       NULL as cached_filename, NULL as cache_status,
-                       NULL as cached_width, NULL as cached_height
+                       CASE
+                           WHEN ci.cache_status = 'cached'
+                            AND ci.cached_filename IS NOT NULL
+                            AND ci.cached_filename NOT LIKE '%%.placeholder'
+                           THEN ci.cached_filename
+                           ELSE NULL
+                       END AS cached_filename,
+                       ci.cache_status,
+                       ci.width as cached_width, ci.height as cached_height
                 FROM pins p
                 LEFT JOIN sections s ON p.section_id = s.id
                 LEFT JOIN boards b ON p.board_id = b.id
+                LEFT JOIN cached_images ci ON p.cached_image_id = ci.id
                 WHERE p.user_id = %s AND {has_image_sql}
                 ORDER BY CRC32(CONCAT(p.id, '-', %s)), p.id
                 LIMIT %s OFFSET %s
             """
-            cursor.execute(fallback_query, params)
+            params = (user['id'], str(seed), limit, offset)
 
-        pins = cursor.fetchall()
+            try:
+                cursor.execute(query, params)
+            except Exception as query_err:
+                logger.warning(f"Random pins query error, retrying without cached_images join: {query_err}")
+                fallback_query = f"""
+                    SELECT p.*, s.name as section_name, b.name as board_name,
+                           NULL as cached_filename, NULL as cache_status,
+                           NULL as cached_width, NULL as cached_height
+                    FROM pins p
+                    LEFT JOIN sections s ON p.section_id = s.id
+                    LEFT JOIN boards b ON p.board_id = b.id
+                    WHERE p.user_id = %s AND {has_image_sql}
+                    ORDER BY CRC32(CONCAT(p.id, '-', %s)), p.id
+                    LIMIT %s OFFSET %s
+                """
+                cursor.execute(fallback_query, params)
+
+            pins = cursor.fetchall()
         has_more = (offset + len(pins)) < total
 
         return jsonify({
@@ -2889,20 +3254,8 @@ def get_random_pins():
         })
 
     except Exception as e:
-        print(f"Error fetching random pins: {str(e)}")
-        traceback.print_exc()
+        logger.exception(f"Error fetching random pins: {str(e)}")
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            try:
-                cursor.close()
-            except Exception:
-                pass
-        if db:
-            try:
-                db.close()
-            except Exception:
-                pass
 
 
 @app.route('/api/board/<int:board_id>/pins')
@@ -2920,91 +3273,87 @@ def get_board_pins(board_id):
     # Cap limit to prevent massive queries
     limit = min(limit, 200)
     
-    db = None
-    cursor = None
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True, buffered=True)
-        
-        # Verify board belongs to user
-        cursor.execute("SELECT id FROM boards WHERE id = %s AND user_id = %s", (board_id, user['id']))
-        if not cursor.fetchone():
-            return jsonify({"error": "Board not found"}), 404
-        
-        # Build query.
-        # See note in board() route: join cached_images without filtering on
-        # cache_status so dimensions from "pending" dims-only rows are visible
-        # for layout stability. Mask the cached_filename when the file isn't
-        # actually on disk yet.
-        query = """
-            SELECT p.*, s.name as section_name, b.name as board_name,
-                   CASE
-                       WHEN ci.cache_status = 'cached'
-                        AND ci.cached_filename IS NOT NULL
-                        AND ci.cached_filename NOT LIKE '%%.placeholder'
-                       THEN ci.cached_filename
-                       ELSE NULL
-                   END AS cached_filename,
-                   ci.cache_status,
-                   ci.width as cached_width, ci.height as cached_height
-            FROM pins p
-            LEFT JOIN sections s ON p.section_id = s.id
-            LEFT JOIN boards b ON p.board_id = b.id
-            LEFT JOIN cached_images ci ON p.cached_image_id = ci.id
-            WHERE p.board_id = %s AND p.user_id = %s
-        """
-        params = [board_id, user['id']]
-        
-        # Add section filtering
-        if section_id:
-            if section_id == 'all':
-                pass # No filter
-            elif section_id == 'undefined':
-                query += " AND p.section_id IS NULL"
-            else:
-                try:
-                    s_id = int(section_id)
-                    query += " AND p.section_id = %s"
-                    params.append(s_id)
-                except ValueError:
-                    pass # Invalid section ID, ignore
-                    
-        # Add ordering and pagination
-        query += " ORDER BY p.created_at DESC, p.id ASC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
-
-        try:
-            cursor.execute(query, tuple(params))
-        except Exception as query_err:
-            # cached_images table may not exist on older installs — retry without that join
-            print(f"Board pins query error, retrying without cached_images join: {query_err}")
-            fallback_query = """
+        with db_cursor() as cursor:
+            # Verify board belongs to user
+            cursor.execute("SELECT id FROM boards WHERE id = %s AND user_id = %s", (board_id, user['id']))
+            if not cursor.fetchone():
+                return jsonify({"error": "Board not found"}), 404
+            
+            # Build query.
+            # See note in board() route: join cached_images without filtering on
+            # cache_status so dimensions from "pending" dims-only rows are visible
+            # for layout stability. Mask the cached_filename when the file isn't
+            # actually on disk yet.
+            query = """
                 SELECT p.*, s.name as section_name, b.name as board_name,
-                       NULL as cached_filename, NULL as cache_status,
-                       NULL as cached_width, NULL as cached_height
+                       CASE
+                           WHEN ci.cache_status = 'cached'
+                            AND ci.cached_filename IS NOT NULL
+                            AND ci.cached_filename NOT LIKE '%%.placeholder'
+                           THEN ci.cached_filename
+                           ELSE NULL
+                       END AS cached_filename,
+                       ci.cache_status,
+                       ci.width as cached_width, ci.height as cached_height
                 FROM pins p
                 LEFT JOIN sections s ON p.section_id = s.id
                 LEFT JOIN boards b ON p.board_id = b.id
+                LEFT JOIN cached_images ci ON p.cached_image_id = ci.id
                 WHERE p.board_id = %s AND p.user_id = %s
             """
-            fallback_params = [board_id, user['id']]
+            params = [board_id, user['id']]
+            
+            # Add section filtering
             if section_id:
                 if section_id == 'all':
-                    pass
+                    pass # No filter
                 elif section_id == 'undefined':
-                    fallback_query += " AND p.section_id IS NULL"
+                    query += " AND p.section_id IS NULL"
                 else:
                     try:
                         s_id = int(section_id)
-                        fallback_query += " AND p.section_id = %s"
-                        fallback_params.append(s_id)
+                        query += " AND p.section_id = %s"
+                        params.append(s_id)
                     except ValueError:
-                        pass
-            fallback_query += " ORDER BY p.created_at DESC, p.id ASC LIMIT %s OFFSET %s"
-            fallback_params.extend([limit, offset])
-            cursor.execute(fallback_query, tuple(fallback_params))
+                        pass # Invalid section ID, ignore
+                        
+            # Add ordering and pagination
+            query += " ORDER BY p.created_at DESC, p.id ASC LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
 
-        pins = cursor.fetchall()
+            try:
+                cursor.execute(query, tuple(params))
+            except Exception as query_err:
+                # cached_images table may not exist on older installs — retry without that join
+                logger.warning(f"Board pins query error, retrying without cached_images join: {query_err}")
+                fallback_query = """
+                    SELECT p.*, s.name as section_name, b.name as board_name,
+                           NULL as cached_filename, NULL as cache_status,
+                           NULL as cached_width, NULL as cached_height
+                    FROM pins p
+                    LEFT JOIN sections s ON p.section_id = s.id
+                    LEFT JOIN boards b ON p.board_id = b.id
+                    WHERE p.board_id = %s AND p.user_id = %s
+                """
+                fallback_params = [board_id, user['id']]
+                if section_id:
+                    if section_id == 'all':
+                        pass
+                    elif section_id == 'undefined':
+                        fallback_query += " AND p.section_id IS NULL"
+                    else:
+                        try:
+                            s_id = int(section_id)
+                            fallback_query += " AND p.section_id = %s"
+                            fallback_params.append(s_id)
+                        except ValueError:
+                            pass
+                fallback_query += " ORDER BY p.created_at DESC, p.id ASC LIMIT %s OFFSET %s"
+                fallback_params.extend([limit, offset])
+                cursor.execute(fallback_query, tuple(fallback_params))
+
+            pins = cursor.fetchall()
 
         return jsonify({
             'success': True,
@@ -3013,48 +3362,22 @@ def get_board_pins(board_id):
         })
 
     except Exception as e:
-        print(f"Error fetching board pins: {str(e)}")
-        traceback.print_exc()
+        logger.exception(f"Error fetching board pins: {str(e)}")
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            try:
-                cursor.close()
-            except Exception:
-                pass
-        if db:
-            try:
-                db.close()
-            except Exception:
-                pass
 
 @app.route('/api/boards')
 @login_required
 def api_boards():
     """Get all boards for API (user-scoped)"""
     user = get_current_user()
-    db = None
-    cursor = None
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM boards WHERE user_id = %s ORDER BY name", (user['id'],))
-        boards = cursor.fetchall()
+        with db_cursor() as cursor:
+            cursor.execute("SELECT * FROM boards WHERE user_id = %s ORDER BY name", (user['id'],))
+            boards = cursor.fetchall()
         return jsonify(boards)
     except Exception as e:
-        print(f"Error getting boards: {str(e)}")
+        logger.error(f"Error getting boards: {str(e)}")
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            try:
-                cursor.close()
-            except Exception:
-                pass
-        if db:
-            try:
-                db.close()
-            except Exception:
-                pass
 
 def _board_status_data(user_id, board_id):
     """
@@ -3062,18 +3385,13 @@ def _board_status_data(user_id, board_id):
     client to update the DOM. Returns None if the board doesn't belong to user_id.
     Shared between the JSON endpoint and the SSE snapshot frame.
     """
-    db = None
-    cursor = None
-    try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-
-        cursor.execute("SELECT id FROM boards WHERE id = %s AND user_id = %s", (board_id, user_id))
-        if not cursor.fetchone():
-            return None
-
-        cursor.execute("""
+    with db_cursor() as cursor:
+        # Ownership, counts and both pin lists in one round trip. Every
+        # statement is scoped by user_id, so a foreign board yields nothing.
+        (stats,), cached_pins, extracted_pins = fetch_result_sets(cursor, [
+            """
             SELECT
+                EXISTS(SELECT 1 FROM boards WHERE id = %s AND user_id = %s) as board_ok,
                 COUNT(*) as total_pins,
                 COUNT(CASE WHEN p.image_url LIKE 'http%%'
                     AND (p.cached_image_id IS NULL OR ci.cache_status IS NULL
@@ -3090,23 +3408,22 @@ def _board_status_data(user_id, board_id):
             LEFT JOIN cached_images ci ON p.cached_image_id = ci.id
             LEFT JOIN url_health uh ON p.id = uh.pin_id
             WHERE p.board_id = %s AND p.user_id = %s
-        """, (board_id, user_id))
-        stats = cursor.fetchone()
-
-        cursor.execute("""
+            """,
+            """
             SELECT p.id, ci.cached_filename
             FROM pins p
             LEFT JOIN cached_images ci ON p.cached_image_id = ci.id AND ci.cache_status = 'cached'
             WHERE p.board_id = %s AND p.user_id = %s AND p.uses_cached_image = 1 AND ci.cached_filename IS NOT NULL
-        """, (board_id, user_id))
-        cached_pins = cursor.fetchall()
-
-        cursor.execute("""
+            """,
+            """
             SELECT id, dominant_color_1, dominant_color_2
             FROM pins
             WHERE board_id = %s AND user_id = %s AND colors_extracted = 1
-        """, (board_id, user_id))
-        extracted_pins = cursor.fetchall()
+            """,
+        ], (board_id, user_id) * 4)
+
+        if not stats['board_ok']:
+            return None
 
         return {
             "success": True,
@@ -3122,17 +3439,6 @@ def _board_status_data(user_id, board_id):
             "cached_pins": [{"id": p["id"], "cached_filename": p["cached_filename"]} for p in cached_pins],
             "extracted_pins": [{"id": p["id"], "color1": p["dominant_color_1"], "color2": p["dominant_color_2"]} for p in extracted_pins],
         }
-    finally:
-        if cursor:
-            try:
-                cursor.close()
-            except Exception:
-                pass
-        if db:
-            try:
-                db.close()
-            except Exception:
-                pass
 
 
 @app.route('/api/board-status/<int:board_id>')
@@ -3190,6 +3496,34 @@ def board_events(board_id):
     }
     return Response(stream_with_context(stream()), headers=headers)
 
+def _mark_url_health_idle(board_id, user_id, idle_key):
+    """
+    Record that nothing on the board is due for a link check, for as long as
+    that stays true: until the earliest pin leaves its grace period, its last
+    check goes stale, or another check's claim on it lapses.
+    """
+    try:
+        with db_cursor() as cursor:
+            cursor.execute("""
+                SELECT TIMESTAMPDIFF(SECOND, NOW(), MIN(GREATEST(
+                           p.created_at + INTERVAL %s HOUR,
+                           COALESCE(uh.last_checked + INTERVAL 1 MONTH, p.created_at),
+                           COALESCE(uh.claimed_until, p.created_at)
+                       ))) AS wait_seconds
+                FROM pins p
+                LEFT JOIN url_health uh ON p.id = uh.pin_id
+                WHERE p.board_id = %s AND p.user_id = %s
+                AND p.link IS NOT NULL AND p.link != ''
+            """, (URL_HEALTH_GRACE_HOURS, board_id, user_id))
+            wait_seconds = cursor.fetchone()['wait_seconds']
+        if wait_seconds is None:
+            wait_seconds = URL_HEALTH_IDLE_MAX_SECONDS
+        ttl = min(max(int(wait_seconds), 0), URL_HEALTH_IDLE_MAX_SECONDS)
+        if ttl > 0:
+            redis_client.setex(idle_key, ttl, 1)
+    except Exception as e:
+        logger.error(f"Error setting URL health idle marker for board {board_id}: {e}")
+
 @app.route('/api/check-url-health/<int:board_id>', methods=['POST'])
 @login_required
 def check_url_health_for_board(board_id):
@@ -3198,61 +3532,88 @@ def check_url_health_for_board(board_id):
         data = request.get_json() or {}
         limit = data.get('limit', 50)  # Default to checking 50 URLs at a time (increased from 10)
         
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        
         # Verify board belongs to user
-        cursor.execute("SELECT id FROM boards WHERE id = %s AND user_id = %s", (board_id, user['id']))
-        if not cursor.fetchone():
-            return jsonify({"error": "Board not found"}), 404
+        with db_cursor() as cursor:
+            cursor.execute("SELECT id FROM boards WHERE id = %s AND user_id = %s", (board_id, user['id']))
+            if not cursor.fetchone():
+                return jsonify({"error": "Board not found"}), 404
         
-        # Get pins with URLs that haven't been checked recently (or at all) (user-scoped)
-        cursor.execute("""
-            SELECT p.id as pin_id, p.link as url
-            FROM pins p
-            LEFT JOIN url_health uh ON p.id = uh.pin_id
-            WHERE p.board_id = %s AND p.user_id = %s
-            AND p.link IS NOT NULL AND p.link != ''
-            AND p.created_at < DATE_SUB(NOW(), INTERVAL %s HOUR)
-            AND (uh.last_checked IS NULL OR uh.last_checked < DATE_SUB(NOW(), INTERVAL 1 MONTH))
-            LIMIT %s
-        """, (board_id, user['id'], URL_HEALTH_GRACE_HOURS, limit))
+        idle_key = URL_HEALTH_IDLE_KEY.format(board_id=board_id)
+        if redis_client:
+            try:
+                if redis_client.exists(idle_key):
+                    return jsonify({
+                        "success": True,
+                        "message": "No URLs need checking",
+                        "checked": 0
+                    })
+            except Exception as e:
+                logger.error(f"Error reading URL health idle marker for board {board_id}: {e}")
         
-        urls_to_check = cursor.fetchall()
+        # Claim pins with URLs that haven't been checked recently (or at all)
+        # (user-scoped). SKIP LOCKED plus the claimed_until mark give concurrent
+        # checks (another tab, a retry) disjoint pins; a claim left by a check
+        # that died lapses after URL_HEALTH_CLAIM_MINUTES. The connection goes
+        # back to the pool before the (slow) network probes run.
+        with tx(dictionary=True) as (db, cursor):
+            cursor.execute("""
+                SELECT p.id as pin_id, p.link as url,
+                       NOW() + INTERVAL %s MINUTE as claim_expires
+                FROM pins p
+                LEFT JOIN url_health uh ON p.id = uh.pin_id
+                WHERE p.board_id = %s AND p.user_id = %s
+                AND p.link IS NOT NULL AND p.link != ''
+                AND p.created_at < DATE_SUB(NOW(), INTERVAL %s HOUR)
+                AND (uh.last_checked IS NULL OR uh.last_checked < DATE_SUB(NOW(), INTERVAL 1 MONTH))
+                AND (uh.claimed_until IS NULL OR uh.claimed_until < NOW())
+                ORDER BY COALESCE(uh.last_checked, '1970-01-01')
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            """, (URL_HEALTH_CLAIM_MINUTES, board_id, user['id'], URL_HEALTH_GRACE_HOURS, limit))
+            
+            urls_to_check = cursor.fetchall()
+            if urls_to_check:
+                cursor.executemany("""
+                    INSERT INTO url_health (pin_id, url, status, claimed_until)
+                    VALUES (%s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE claimed_until = VALUES(claimed_until)
+                """, [(u['pin_id'], u['url'], 'unknown', u['claim_expires']) for u in urls_to_check])
         
         if not urls_to_check:
+            if redis_client:
+                _mark_url_health_idle(board_id, user['id'], idle_key)
             return jsonify({
                 "success": True,
                 "message": "No URLs need checking",
                 "checked": 0
             })
         
-        import concurrent.futures
-        from threading import Lock
-        
-        checked_count = 0
-        db_lock = Lock()
-        
         def check_single_url(url_data):
-            nonlocal checked_count
-            status, archive_url = check_url_live_status(url_data['url'])
-
-            with db_lock:
-                _upsert_url_health(cursor, url_data['pin_id'], url_data['url'], status, archive_url)
-                checked_count += 1
+            # One bad URL must not fail the batch: that would drop the results
+            # already probed and leave every claimed pin locked until the
+            # claim expires
+            try:
+                status, archive_url = check_url_live_status(url_data['url'])
+            except Exception as e:
+                logger.warning(f"[health] pin {url_data['pin_id']} check failed: {e}")
+                status, archive_url = 'unknown', None
 
             try:
                 event_bus.publish(board_id, "url_checked",
                                   {"pin_id": url_data['pin_id'], "status": status, "archive_url": archive_url})
             except Exception as e:
-                print(f"[health] pin {url_data['pin_id']} publish failed: {e}")
+                logger.warning(f"[health] pin {url_data['pin_id']} publish failed: {e}")
+            return url_data, status, archive_url
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            executor.map(check_single_url, urls_to_check)
+        # Probes only touch the network; results are written afterwards
+        results = list(_URL_CHECK_EXECUTOR.map(check_single_url, urls_to_check))
         
-        db.commit()
-        cursor.close()
-        db.close()
+        with tx() as (db, cursor):
+            _upsert_url_health_many(cursor, [
+                (url_data['pin_id'], url_data['url'], status, archive_url)
+                for url_data, status, archive_url in results
+            ])
+        checked_count = len(results)
         
         return jsonify({
             "success": True,
@@ -3271,12 +3632,10 @@ def check_pin_url(pin_id):
     """Manually check URL health for a single pin"""
     user = get_current_user()
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        
-        # Verify pin belongs to user
-        cursor.execute("SELECT id, link, board_id FROM pins WHERE id = %s AND user_id = %s", (pin_id, user['id']))
-        pin = cursor.fetchone()
+        with db_cursor() as cursor:
+            # Verify pin belongs to user
+            cursor.execute("SELECT id, link, board_id FROM pins WHERE id = %s AND user_id = %s", (pin_id, user['id']))
+            pin = cursor.fetchone()
         
         if not pin:
             return jsonify({"success": False, "error": "Pin not found"}), 404
@@ -3284,19 +3643,17 @@ def check_pin_url(pin_id):
         if not pin['link']:
             return jsonify({"success": False, "error": "Pin has no URL to check"}), 400
         
+        # Probe without holding a pooled connection
         status, archive_url = check_url_live_status(pin['link'], timeout=5)
         
-        _upsert_url_health(cursor, pin_id, pin['link'], status, archive_url)
-        
-        db.commit()
-        cursor.close()
-        db.close()
+        with db_cursor() as cursor:
+            _upsert_url_health(cursor, pin_id, pin['link'], status, archive_url)
 
         try:
             event_bus.publish(pin['board_id'], "url_checked",
                               {"pin_id": pin_id, "status": status, "archive_url": archive_url})
         except Exception as e:
-            print(f"[health] pin {pin_id} publish failed: {e}")
+            logger.warning(f"[health] pin {pin_id} publish failed: {e}")
 
         return jsonify({
             "success": True,
@@ -3307,8 +3664,7 @@ def check_pin_url(pin_id):
     except mysql.connector.Error as e:
         return jsonify({"success": False, "error": str(e)}), 500
     except Exception as e:
-        print(f"Error checking pin URL: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception(f"Error checking pin URL: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/debug-url-health/<int:board_id>')
@@ -3317,57 +3673,50 @@ def debug_url_health(board_id):
     """Debug endpoint to check URL health status for a specific board"""
     user = get_current_user()
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        
-        # Verify board belongs to user
-        cursor.execute("SELECT id FROM boards WHERE id = %s AND user_id = %s", (board_id, user['id']))
-        if not cursor.fetchone():
-            return jsonify({"error": "Board not found"}), 404
-        
-        # Get all pins with links on this board (user-scoped)
-        cursor.execute("""
-            SELECT p.id, p.title, p.link, uh.status, uh.last_checked
-            FROM pins p
-            LEFT JOIN url_health uh ON p.id = uh.pin_id
-            WHERE p.board_id = %s AND p.user_id = %s AND p.link IS NOT NULL
-            ORDER BY p.id
-        """, (board_id, user['id']))
-        
-        pins_with_links = cursor.fetchall()
-        
-        # Get pins that would be checked by the health checker (user-scoped)
-        cursor.execute("""
-            SELECT p.id as pin_id, p.link as url, uh.last_checked, uh.status
-            FROM pins p
-            LEFT JOIN url_health uh ON p.id = uh.pin_id
-            WHERE p.board_id = %s AND p.user_id = %s
-            AND p.link IS NOT NULL AND p.link != ''
-            AND p.created_at < DATE_SUB(NOW(), INTERVAL %s HOUR)
-            AND (uh.last_checked IS NULL OR uh.last_checked < DATE_SUB(NOW(), INTERVAL 1 MONTH))
-            LIMIT 20
-        """, (board_id, user['id'], URL_HEALTH_GRACE_HOURS))
-        
-        urls_to_check = cursor.fetchall()
-        
-        # Get counts (user-scoped)
-        cursor.execute("""
-            SELECT 
-                COUNT(CASE WHEN p.link IS NOT NULL THEN 1 END) as pins_with_links,
-                COUNT(CASE WHEN uh.status IS NOT NULL THEN 1 END) as health_checked_count,
-                COUNT(CASE WHEN uh.status = 'live' THEN 1 END) as live_links,
-                COUNT(CASE WHEN uh.status = 'broken' THEN 1 END) as broken_links,
-                COUNT(CASE WHEN uh.status = 'archived' THEN 1 END) as archived_links,
-                COUNT(CASE WHEN uh.status = 'unknown' THEN 1 END) as unknown_links
-            FROM pins p
-            LEFT JOIN url_health uh ON p.id = uh.pin_id
-            WHERE p.board_id = %s AND p.user_id = %s
-        """, (board_id, user['id']))
-        
-        stats = cursor.fetchone()
-        
-        cursor.close()
-        db.close()
+        with db_cursor() as cursor:
+            # Ownership check, both pin lists and the counts in one round
+            # trip; every statement is user-scoped
+            owned, pins_with_links, urls_to_check, (stats,) = fetch_result_sets(cursor, [
+                "SELECT 1 FROM boards WHERE id = %s AND user_id = %s",
+                # All pins with links on this board
+                """
+                SELECT p.id, p.title, p.link, uh.status, uh.last_checked
+                FROM pins p
+                LEFT JOIN url_health uh ON p.id = uh.pin_id
+                WHERE p.board_id = %s AND p.user_id = %s AND p.link IS NOT NULL
+                ORDER BY p.id
+                """,
+                # Pins that would be checked by the health checker
+                """
+                SELECT p.id as pin_id, p.link as url, uh.last_checked, uh.status
+                FROM pins p
+                LEFT JOIN url_health uh ON p.id = uh.pin_id
+                WHERE p.board_id = %s AND p.user_id = %s
+                AND p.link IS NOT NULL AND p.link != ''
+                AND p.created_at < DATE_SUB(NOW(), INTERVAL %s HOUR)
+                AND (uh.last_checked IS NULL OR uh.last_checked < DATE_SUB(NOW(), INTERVAL 1 MONTH))
+                LIMIT 20
+                """,
+                """
+                SELECT 
+                    COUNT(CASE WHEN p.link IS NOT NULL THEN 1 END) as pins_with_links,
+                    COUNT(CASE WHEN uh.status IS NOT NULL THEN 1 END) as health_checked_count,
+                    COUNT(CASE WHEN uh.status = 'live' THEN 1 END) as live_links,
+                    COUNT(CASE WHEN uh.status = 'broken' THEN 1 END) as broken_links,
+                    COUNT(CASE WHEN uh.status = 'archived' THEN 1 END) as archived_links,
+                    COUNT(CASE WHEN uh.status = 'unknown' THEN 1 END) as unknown_links
+                FROM pins p
+                LEFT JOIN url_health uh ON p.id = uh.pin_id
+                WHERE p.board_id = %s AND p.user_id = %s
+                """,
+            ], (
+                board_id, user['id'],
+                board_id, user['id'],
+                board_id, user['id'], URL_HEALTH_GRACE_HOURS,
+                board_id, user['id'],
+            ))
+            if not owned:
+                return jsonify({"error": "Board not found"}), 404
         
         return jsonify({
             "success": True,
@@ -3383,6 +3732,73 @@ def debug_url_health(board_id):
     except Exception as e:
         return jsonify({"success": False, "error": f"Error: {str(e)}"}), 500
 
+# Most pins a /save-pin-colors batch may carry
+PIN_COLORS_BATCH_MAX = 200
+
+def _save_pin_colors(user_id, updates):
+    """
+    Store {pin_id: (color1, color2)} for the user's pins in one round trip:
+    the owned pins' board_ids (for the SSE events) and a single CASE UPDATE.
+    Returns [(pin_id, board_id, color1, color2)] for the pins that were saved;
+    ids that aren't the user's are skipped.
+    """
+    ids = ", ".join(["%s"] * len(updates))
+    cases = " ".join(["WHEN %s THEN %s"] * len(updates))
+    params = [user_id, *updates]
+    for index in (0, 1):
+        params.extend(value for pin_id, colors in updates.items() for value in (pin_id, colors[index]))
+    params.append(user_id)
+    params.extend(updates)
+    with db_cursor() as cursor:
+        (owned,) = fetch_result_sets(cursor, [
+            f"SELECT id, board_id FROM pins WHERE user_id = %s AND id IN ({ids})",
+            f"""
+            UPDATE pins
+            SET dominant_color_1 = CASE id {cases} END,
+                dominant_color_2 = CASE id {cases} END,
+                colors_extracted = TRUE
+            WHERE user_id = %s AND id IN ({ids})
+            """,
+        ], tuple(params))
+    return [(row['id'], row['board_id'], *updates[row['id']]) for row in owned]
+
+def _publish_pin_colors(saved):
+    for pin_id, board_id, color1, color2 in saved:
+        try:
+            event_bus.publish(board_id, "pin_colored",
+                              {"pin_id": pin_id, "c1": color1, "c2": color2})
+        except Exception as e:
+            logger.warning(f"[colors] pin {pin_id} publish failed: {e}")
+
+@app.route('/save-pin-colors', methods=['POST'])
+@login_required
+def save_pin_colors_bulk():
+    """Save extracted colors for many pins: {"updates": [{pin_id, dominant_color_1, dominant_color_2}, ...]}"""
+    user = get_current_user()
+    try:
+        data = request.get_json() or {}
+        updates = {}
+        for item in (data.get('updates') or [])[:PIN_COLORS_BATCH_MAX]:
+            pin_id = sanitize_integer(item.get('pin_id'))
+            dominant_color_1 = item.get('dominant_color_1')
+            dominant_color_2 = item.get('dominant_color_2')
+            if pin_id and dominant_color_1 and dominant_color_2:
+                updates[pin_id] = (dominant_color_1, dominant_color_2)
+
+        if not updates:
+            return jsonify({"error": "No color updates provided"}), 400
+
+        saved = _save_pin_colors(user['id'], updates)
+        _publish_pin_colors(saved)
+
+        return jsonify({
+            'success': True,
+            'pin_ids': [pin_id for pin_id, _, _, _ in saved]
+        })
+    except Exception as e:
+        logger.error(f"Error saving pin colors: {str(e)}")
+        return jsonify({"error": "Failed to save colors"}), 500
+
 @app.route('/save-pin-colors/<int:pin_id>', methods=['POST'])
 @login_required
 def save_pin_colors(pin_id):
@@ -3395,43 +3811,18 @@ def save_pin_colors(pin_id):
         if not dominant_color_1 or not dominant_color_2:
             return jsonify({"error": "Both colors are required"}), 400
         
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-
-        # Verify pin belongs to user and capture board_id for the SSE event
-        cursor.execute("SELECT id, board_id FROM pins WHERE id = %s AND user_id = %s", (pin_id, user['id']))
-        row = cursor.fetchone()
-        if not row:
+        saved = _save_pin_colors(user['id'], {pin_id: (dominant_color_1, dominant_color_2)})
+        if not saved:
             return jsonify({"error": "Pin not found"}), 404
-        board_id = row['board_id']
-
-        # Update the pin with extracted colors
-        cursor.execute("""
-            UPDATE pins
-            SET dominant_color_1 = %s,
-                dominant_color_2 = %s,
-                colors_extracted = TRUE
-            WHERE id = %s
-        """, (dominant_color_1, dominant_color_2, pin_id))
-
-        db.commit()
-
-        try:
-            event_bus.publish(board_id, "pin_colored",
-                              {"pin_id": pin_id, "c1": dominant_color_1, "c2": dominant_color_2})
-        except Exception as e:
-            print(f"[colors] pin {pin_id} publish failed: {e}")
+        _publish_pin_colors(saved)
 
         return jsonify({
             'success': True,
             'pin_id': pin_id
         })
     except Exception as e:
-        print(f"Error saving pin colors: {str(e)}")
+        logger.error(f"Error saving pin colors: {str(e)}")
         return jsonify({"error": "Failed to save colors"}), 500
-    finally:
-        cursor.close()
-        db.close()
 
 @app.route('/save-pin-dimensions/<int:pin_id>', methods=['POST'])
 @login_required
@@ -3443,8 +3834,6 @@ def save_pin_dimensions(pin_id):
     property, so no layout shift occurs.
     """
     user = get_current_user()
-    db = None
-    cursor = None
     try:
         data = request.get_json()
         width = sanitize_integer(data.get('width'), min_value=1, max_value=20000)
@@ -3453,56 +3842,52 @@ def save_pin_dimensions(pin_id):
         if not width or not height:
             return jsonify({"error": "Invalid dimensions"}), 400
 
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-
-        # Fetch pin + its cached_images record (if any) in one query
-        cursor.execute("""
-            SELECT p.id, p.image_url, p.cached_image_id, p.board_id,
-                   ci.cached_filename, ci.cache_status
-              FROM pins p
-              LEFT JOIN cached_images ci ON ci.id = p.cached_image_id
-             WHERE p.id = %s AND p.user_id = %s
-        """, (pin_id, user['id']))
-        pin = cursor.fetchone()
-        if not pin:
-            return jsonify({"error": "Pin not found"}), 404
-
-        image_url = pin['image_url'] or ''
-        cache_id = pin['cached_image_id']
-        board_id = pin['board_id']
+        with tx(dictionary=True) as (db, cursor):
+            # Fetch pin + its cached_images record (if any) in one query
+            cursor.execute("""
+                SELECT p.id, p.image_url, p.cached_image_id, p.board_id,
+                       ci.cached_filename, ci.cache_status
+                  FROM pins p
+                  LEFT JOIN cached_images ci ON ci.id = p.cached_image_id
+                 WHERE p.id = %s AND p.user_id = %s
+            """, (pin_id, user['id']))
+            pin = cursor.fetchone()
+            if not pin:
+                return jsonify({"error": "Pin not found"}), 404
 
-        # Determine whether a real local file already exists
-        already_cached = (
-            pin['cached_filename']
-            and not pin['cached_filename'].endswith('.placeholder')
-            and pin['cache_status'] == 'cached'
-        )
+            image_url = pin['image_url'] or ''
+            cache_id = pin['cached_image_id']
+            board_id = pin['board_id']
 
-        if cache_id:
-            # Update dims on the existing record (even if already_cached, dims may need fixing)
-            cursor.execute(
-                "UPDATE cached_images SET width=%s, height=%s, updated_at=NOW() WHERE id=%s",
-                (width, height, cache_id)
-            )
-        else:
-            # No record yet — create a dims-only placeholder so the template
-            # renders the correct aspect-ratio on the very next page load.
-            url_hash = hashlib.md5(image_url.encode()).hexdigest()[:16]
-            placeholder = f"{url_hash}_dims_only.placeholder"
-            cursor.execute("""
-                INSERT INTO cached_images
-                    (original_url, cached_filename, file_size, width, height, quality_level, cache_status)
-                VALUES (%s, %s, 0, %s, %s, 'low', 'pending')
-                ON DUPLICATE KEY UPDATE width=%s, height=%s, updated_at=NOW()
-            """, (image_url, placeholder, width, height, width, height))
-            cache_id = cursor.lastrowid
-            cursor.execute(
-                "UPDATE pins SET cached_image_id=%s WHERE id=%s AND cached_image_id IS NULL",
-                (cache_id, pin_id)
+            # Determine whether a real local file already exists
+            already_cached = (
+                pin['cached_filename']
+                and not pin['cached_filename'].endswith('.placeholder')
+                and pin['cache_status'] == 'cached'
             )
 
-        db.commit()
+            if cache_id:
+                # Update dims on the existing record (even if already_cached, dims may need fixing)
+                cursor.execute(
+                    "UPDATE cached_images SET width=%s, height=%s, updated_at=NOW() WHERE id=%s",
+                    (width, height, cache_id)
+                )
+            else:
+                # No record yet — create a dims-only placeholder so the template
+                # renders the correct aspect-ratio on the very next page load.
+                url_hash = hashlib.md5(image_url.encode()).hexdigest()[:16]
+                placeholder = f"{url_hash}_dims_only.placeholder"
+                cursor.execute("""
+                    INSERT INTO cached_images
+                        (original_url, cached_filename, file_size, width, height, quality_level, cache_status)
+                    VALUES (%s, %s, 0, %s, %s, 'low', 'pending')
+                    ON DUPLICATE KEY UPDATE width=%s, height=%s, updated_at=NOW()
+                """, (image_url, placeholder, width, height, width, height))
+                cache_id = cursor.lastrowid
+                cursor.execute(
+                    "UPDATE pins SET cached_image_id=%s WHERE id=%s AND cached_image_id IS NULL",
+                    (cache_id, pin_id)
+                )
 
         # Queue a background caching job if the file isn't already on disk.
         # ImageCacheService resizes/encodes and updates cached_images + pins
@@ -3515,18 +3900,13 @@ def save_pin_dimensions(pin_id):
                 cache_service = _get_cache_service()
                 cache_service.queue_image_for_caching(pin_id, image_url, 'low', board_id)
             except Exception as e:
-                print(f"Failed to queue image for caching: {e}")
+                logger.error(f"Failed to queue image for caching: {e}")
 
         return jsonify({'success': True})
 
     except Exception as e:
-        print(f"Error saving pin dimensions: {e}")
+        logger.error(f"Error saving pin dimensions: {e}")
         return jsonify({"error": "Failed to save dimensions"}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if db:
-            db.close()
 
 
 @app.route('/delete-pin/<int:pin_id>', methods=['POST'])
@@ -3536,30 +3916,28 @@ def delete_pin(pin_id):
     user = get_current_user()
     try:
         with tx() as (db, cursor):
-            cursor.execute("SELECT id FROM pins WHERE id = %s AND user_id = %s",
-                           (pin_id, user['id']))
-            if not cursor.fetchone():
-                return jsonify({"error": "Pin not found"}), 404
-
+            # The undo snapshot doubles as the ownership check
             before = snapshot_pin(cursor, pin_id)
-            board_id = before['board_id'] if before else None
-
-            cursor.execute("DELETE FROM pins WHERE id = %s AND user_id = %s",
-                           (pin_id, user['id']))
-
-            record_audit(cursor, action='pin.delete', entity_type='pin',
-                         entity_id=pin_id, user_id=user['id'],
-                         actor_email=user.get('email'),
-                         before=before, after=None,
-                         metadata={'route': request.path, 'board_id': board_id},
-                         ip_address=request.remote_addr)
+            if not before or before['user_id'] != user['id']:
+                return jsonify({"error": "Pin not found"}), 404
+            board_id = before['board_id']
+
+            execute_statements(cursor, [
+                "DELETE FROM pins WHERE id = %s AND user_id = %s",
+                AUDIT_INSERT_SQL,
+            ], (pin_id, user['id']) + audit_params(
+                action='pin.delete', entity_type='pin',
+                entity_id=pin_id, user_id=user['id'],
+                actor_email=user.get('email'),
+                before=before, after=None,
+                metadata={'route': request.path, 'board_id': board_id},
+                ip_address=request.remote_addr))
 
-        if redis_client:
-            redis_client.delete(f"view:{user['id']}:/")
+        invalidate_pin_caches(user['id'])
 
         return jsonify({'success': True, 'board_id': board_id})
     except Exception as e:
-        print(f"Error deleting pin: {str(e)}")
+        logger.error(f"Error deleting pin: {str(e)}")
         return jsonify({"error": "Failed to delete pin"}), 500
 
 @app.route('/check-archive/<int:pin_id>', methods=['POST'])
@@ -3567,21 +3945,17 @@ def delete_pin(pin_id):
 def check_archive(pin_id):
     """Manually check Wayback Machine for an archived version of a pin's URL"""
     user = get_current_user()
-    db = None
-    cursor = None
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        
-        # Get the pin and verify ownership
-        cursor.execute("""
-            SELECT p.link, uh.status, uh.archive_url
-            FROM pins p
-            LEFT JOIN url_health uh ON p.id = uh.pin_id
-            WHERE p.id = %s AND p.user_id = %s
-        """, (pin_id, user['id']))
+        with db_cursor() as cursor:
+            # Get the pin and verify ownership
+            cursor.execute("""
+                SELECT p.link, uh.status, uh.archive_url
+                FROM pins p
+                LEFT JOIN url_health uh ON p.id = uh.pin_id
+                WHERE p.id = %s AND p.user_id = %s
+            """, (pin_id, user['id']))
+            pin = cursor.fetchone()
         
-        pin = cursor.fetchone()
         if not pin or not pin['link']:
             return jsonify({"error": "Pin not found or has no link"}), 404
         
@@ -3589,8 +3963,7 @@ def check_archive(pin_id):
         
         # Check Wayback Machine for archives
         try:
-            wayback_api = f"https://archive.org/wayback/available?url={url}"
-            response = requests.get(wayback_api, timeout=10)
+            response = _URL_CHECK_SESSION.get(WAYBACK_AVAILABLE_API, params={'url': url}, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -3600,9 +3973,10 @@ def check_archive(pin_id):
                 if closest.get('available'):
                     archive_url = closest['url']
                     timestamp = closest.get('timestamp', '')
+                    _cache_archive_url(url, archive_url)
                     
-                    _upsert_url_health(cursor, pin_id, url, 'archived', archive_url)
-                    db.commit()
+                    with db_cursor() as cursor:
+                        _upsert_url_health(cursor, pin_id, url, 'archived', archive_url)
                     
                     return jsonify({
                         'success': True,
@@ -3621,23 +3995,12 @@ def check_archive(pin_id):
                 return jsonify({"error": "Failed to contact Wayback Machine"}), 500
                 
         except requests.RequestException as e:
-            print(f"Error checking Wayback Machine: {str(e)}")
+            logger.error(f"Error checking Wayback Machine: {str(e)}")
             return jsonify({"error": "Failed to check Wayback Machine"}), 500
             
     except Exception as e:
-        print(f"Error in check_archive: {str(e)}")
+        logger.error(f"Error in check_archive: {str(e)}")
         return jsonify({"error": "An error occurred"}), 500
-    finally:
-        if cursor:
-            try:
-                cursor.close()
-            except Exception:
-                pass
-        if db:
-            try:
-                db.close()
-            except Exception:
-                pass
 
 # ============================================================================
 # AUDIT LOG VIEWER + UNDO
@@ -3699,9 +4062,7 @@ def api_audit_log():
         params.append(outcome)
     where_sql = ' AND '.join(where)
 
-    db = get_db_connection()
-    cursor = db.cursor(dictionary=True)
-    try:
+    with db_cursor() as cursor:
         cursor.execute(f"SELECT COUNT(*) AS total FROM audit_log WHERE {where_sql}", tuple(params))
         total = (cursor.fetchone() or {}).get('total', 0)
 
@@ -3719,42 +4080,33 @@ def api_audit_log():
         )
         rows = cursor.fetchall() or []
 
-        for r in rows:
-            if r.get('created_at'):
-                r['created_at'] = r['created_at'].isoformat()
-            for col in ('before_data', 'after_data', 'metadata'):
-                val = r.get(col)
-                if isinstance(val, (bytes, bytearray)):
-                    try:
-                        val = val.decode('utf-8')
-                    except Exception:
-                        val = None
-                if isinstance(val, str) and val:
-                    try:
-                        r[col] = json.loads(val)
-                    except Exception:
-                        r[col] = None
-            r['undoable'] = (
-                r.get('action') in UNDOABLE_ACTIONS
-                and r.get('outcome') == 'success'
-                and bool(r.get('before_data'))
-            )
+    for r in rows:
+        if r.get('created_at'):
+            r['created_at'] = r['created_at'].isoformat()
+        for col in ('before_data', 'after_data', 'metadata'):
+            val = r.get(col)
+            if isinstance(val, (bytes, bytearray)):
+                try:
+                    val = val.decode('utf-8')
+                except Exception:
+                    val = None
+            if isinstance(val, str) and val:
+                try:
+                    r[col] = json.loads(val)
+                except Exception:
+                    r[col] = None
+        r['undoable'] = (
+            r.get('action') in UNDOABLE_ACTIONS
+            and r.get('outcome') == 'success'
+            and bool(r.get('before_data'))
+        )
 
-        return jsonify({
-            'items': rows,
-            'total': total,
-            'limit': limit,
-            'offset': offset,
-        })
-    finally:
-        try:
-            cursor.close()
-        except Exception:
-            pass
-        try:
-            db.close()
-        except Exception:
-            pass
+    return jsonify({
+        'items': rows,
+        'total': total,
+        'limit': limit,
+        'offset': offset,
+    })
 
 
 EXTENSION_SOURCE_DIR = os.getenv('EXTENSION_SOURCE_DIR', '/extension-src')
@@ -3819,27 +4171,19 @@ def settings_page():
 @login_required
 def list_api_tokens():
     user = get_current_user()
-    db = None
-    cursor = None
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT id, name, created_at, last_used_at
-            FROM api_tokens
-            WHERE user_id = %s AND revoked_at IS NULL
-            ORDER BY created_at DESC
-        """, (user['id'],))
-        tokens = cursor.fetchall()
+        with db_cursor() as cursor:
+            cursor.execute("""
+                SELECT id, name, created_at, last_used_at
+                FROM api_tokens
+                WHERE user_id = %s AND revoked_at IS NULL
+                ORDER BY created_at DESC
+            """, (user['id'],))
+            tokens = cursor.fetchall()
         return jsonify(tokens)
     except Exception as e:
-        print(f"Error listing API tokens: {str(e)}")
+        logger.error(f"Error listing API tokens: {str(e)}")
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if db:
-            db.close()
 
 
 @app.route('/api/tokens', methods=['POST'])
@@ -3872,7 +4216,7 @@ def create_api_token():
 
         return jsonify({'success': True, 'id': token_id, 'name': name, 'token': plaintext})
     except Exception as e:
-        print(f"Error creating API token: {str(e)}")
+        logger.error(f"Error creating API token: {str(e)}")
         return jsonify({"error": "Failed to create token"}), 500
 
 
@@ -3899,7 +4243,7 @@ def revoke_api_token(token_id):
 
         return jsonify({'success': True})
     except Exception as e:
-        print(f"Error revoking API token: {str(e)}")
+        logger.error(f"Error revoking API token: {str(e)}")
         return jsonify({"error": "Failed to revoke token"}), 500
 
 
@@ -4125,10 +4469,7 @@ def audit_undo(audit_id):
                 ip_address=request.remote_addr,
             )
 
-        try:
-            redis_client.delete(f"view:{user['id']}:/")
-        except Exception:
-            pass
+        invalidate_pin_caches(user['id'])
         return jsonify({'success': True, 'result': result})
     except PermissionError as e:
         return jsonify({'error': str(e)}), 403
@@ -4138,7 +4479,7 @@ def audit_undo(audit_id):
         # Most common: an entity with the snapshotted id already exists.
         return jsonify({'error': f'Cannot restore: {e.msg or str(e)}'}), 409
     except Exception as e:
-        print(f"Error in audit_undo: {e}")
+        logger.error(f"Error in audit_undo: {e}")
         return jsonify({'error': 'Failed to undo'}), 500
 
 
@@ -4147,47 +4488,41 @@ def audit_undo(audit_id):
 # ============================================================================
 
 def create_indexes():
-    db = None
-    cursor = None
     try:
-        db = get_db_connection()
-        cursor = db.cursor()
-        
-        # Create indexes for frequently queried columns
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_boards_name ON boards(name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_pins_board_id ON pins(board_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_pins_section_id ON pins(section_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sections_board_id ON sections(board_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_pins_created_at ON pins(created_at)")
-        
-        # Create URL health tracking table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS url_health (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                pin_id INT NOT NULL,
-                url VARCHAR(2048) NOT NULL,
-                last_checked DATETIME,
-                status ENUM('unknown', 'live', 'broken', 'archived') DEFAULT 'unknown',
-                archive_url VARCHAR(2048),
-                FOREIGN KEY (pin_id) REFERENCES pins(id) ON DELETE CASCADE
-            )
-        """)
+        with db_cursor(dictionary=False) as cursor:
+            # Every statement is IF NOT EXISTS, so on an up-to-date schema this
+            # is a no-op; sent as one batch so boot costs a single round trip.
+            execute_statements(cursor, [
+                # Indexes for frequently queried columns
+                "CREATE INDEX IF NOT EXISTS idx_boards_name ON boards(name)",
+                "CREATE INDEX IF NOT EXISTS idx_boards_user_name ON boards(user_id, name)",
+                "CREATE INDEX IF NOT EXISTS idx_pins_board_id ON pins(board_id)",
+                "CREATE INDEX IF NOT EXISTS idx_pins_section_id ON pins(section_id)",
+                "CREATE INDEX IF NOT EXISTS idx_sections_board_id ON sections(board_id)",
+                "CREATE INDEX IF NOT EXISTS idx_pins_created_at ON pins(created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_pins_board_user_created_desc ON pins(board_id, user_id, created_at DESC, id)",
+                "CREATE FULLTEXT INDEX IF NOT EXISTS ft_pins_title_desc ON pins(title, description)",
+                # URL health tracking table
+                """
+                CREATE TABLE IF NOT EXISTS url_health (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    pin_id INT NOT NULL,
+                    url VARCHAR(2048) NOT NULL,
+                    last_checked DATETIME,
+                    status ENUM('unknown', 'live', 'broken', 'archived') DEFAULT 'unknown',
+                    archive_url VARCHAR(2048),
+                    claimed_until DATETIME NULL,
+                    FOREIGN KEY (pin_id) REFERENCES pins(id) ON DELETE CASCADE,
+                    UNIQUE KEY unique_url_health_pin_id (pin_id),
+                    INDEX idx_url_health_pin_status_checked (pin_id, status, last_checked)
+                )
+                """,
+                "CREATE INDEX IF NOT EXISTS idx_url_health_pin_status_checked ON url_health(pin_id, status, last_checked)",
+            ])
         
-        db.commit()
-        print("✅ Database indexes and URL health table created successfully")
+        logger.info("✅ Database indexes and URL health table created successfully")
     except mysql.connector.Error as err:
-        print(f"❌ Error creating indexes: {err}")
-    finally:
-        if cursor:
-            try:
-                cursor.close()
-            except Exception:
-                pass
-        if db:
-            try:
-                db.close()
-            except Exception:
-                pass
+        logger.error(f"❌ Error creating indexes: {err}")
 
 # Note: Background URL health checking has been disabled in favor of JavaScript-based processing
 # The check_url_health_for_board API endpoint is used instead for on-demand checking
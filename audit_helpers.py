@@ -42,8 +42,15 @@ def _rows_to_dicts(cursor, rows):
     return [dict(zip(cols, r)) for r in rows]
 
 
-def record_audit(
-    cursor,
+AUDIT_INSERT_SQL = """
+    INSERT INTO audit_log
+      (user_id, actor_email, action, entity_type, entity_id,
+       before_data, after_data, metadata, request_id, ip_address, outcome)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+def audit_params(
     *,
     action: str,
     entity_type: str,
@@ -56,24 +63,26 @@ def record_audit(
     request_id: Optional[str] = None,
     ip_address: Optional[str] = None,
     outcome: str = 'success',
-) -> int:
-    """Insert one row into audit_log using the caller's cursor.
+) -> tuple:
+    """Placeholder values for AUDIT_INSERT_SQL.
 
-    Returns the inserted audit_log.id.
+    For callers that send the audit row in the same round trip as their
+    mutation (see execute_statements in app.py).
     """
-    cursor.execute(
-        """
-        INSERT INTO audit_log
-          (user_id, actor_email, action, entity_type, entity_id,
-           before_data, after_data, metadata, request_id, ip_address, outcome)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """,
-        (
-            user_id, actor_email, action, entity_type, entity_id,
-            _to_json(before), _to_json(after), _to_json(metadata),
-            request_id or uuid.uuid4().hex[:32], ip_address, outcome,
-        ),
+    return (
+        user_id, actor_email, action, entity_type, entity_id,
+        _to_json(before), _to_json(after), _to_json(metadata),
+        request_id or uuid.uuid4().hex[:32], ip_address, outcome,
     )
+
+
+def record_audit(cursor, **fields) -> int:
+    """Insert one row into audit_log using the caller's cursor.
+
+    Takes the keyword arguments of audit_params(). Returns the inserted
+    audit_log.id.
+    """
+    cursor.execute(AUDIT_INSERT_SQL, audit_params(**fields))
     return cursor.lastrowid
 
 
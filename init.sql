@@ -35,10 +35,11 @@ CREATE TABLE IF NOT EXISTS boards (
     user_id INT NOT NULL,
     name VARCHAR(255) NOT NULL,
     slug VARCHAR(255),
+    pin_count INT NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-    INDEX idx_boards_user_id (user_id),
+    INDEX idx_boards_user_name (user_id, name),
     INDEX idx_boards_name (name),
     INDEX idx_boards_slug (slug),
     INDEX idx_boards_created_at (created_at)
@@ -91,9 +92,24 @@ CREATE TABLE IF NOT EXISTS pins (
     INDEX idx_pins_section_id (section_id),
     INDEX idx_pins_created_at (created_at),
     INDEX idx_pins_updated_at (updated_at),
-    INDEX idx_pins_title (title(100))
+    INDEX idx_pins_title (title(100)),
+    INDEX idx_pins_board_user_created_desc (board_id, user_id, created_at DESC, id),
+    FULLTEXT INDEX ft_pins_title_desc (title, description)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Keep boards.pin_count in step with the pins table
+CREATE TRIGGER IF NOT EXISTS trg_pins_ai AFTER INSERT ON pins FOR EACH ROW
+    UPDATE boards SET pin_count = pin_count + 1, updated_at = updated_at WHERE id = NEW.board_id;
+
+CREATE TRIGGER IF NOT EXISTS trg_pins_ad AFTER DELETE ON pins FOR EACH ROW
+    UPDATE boards SET pin_count = GREATEST(pin_count - 1, 0), updated_at = updated_at WHERE id = OLD.board_id;
+
+CREATE TRIGGER IF NOT EXISTS trg_pins_au AFTER UPDATE ON pins FOR EACH ROW
+    UPDATE boards
+    SET pin_count = GREATEST(pin_count + (id = NEW.board_id) - (id = OLD.board_id), 0),
+        updated_at = updated_at
+    WHERE id IN (OLD.board_id, NEW.board_id) AND OLD.board_id <> NEW.board_id;
+
 -- Cached images table (for image optimization)
 CREATE TABLE IF NOT EXISTS cached_images (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -124,10 +140,12 @@ CREATE TABLE IF NOT EXISTS url_health (
     last_checked DATETIME,
     status ENUM('unknown', 'live', 'broken', 'archived') DEFAULT 'unknown',
     archive_url VARCHAR(2048),
+    claimed_until DATETIME NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (pin_id) REFERENCES pins(id) ON DELETE CASCADE,
     UNIQUE KEY unique_url_health_pin_id (pin_id),
+    INDEX idx_url_health_pin_status_checked (pin_id, status, last_checked),
     INDEX idx_url_health_status (status),
     INDEX idx_url_health_last_checked (last_checked)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -85,6 +85,14 @@ def index_exists(cursor, table_name, index_name):
     """, (table_name, index_name))
     return cursor.fetchone()[0] > 0
 
+def trigger_exists(cursor, trigger_name):
+    """Check if a trigger exists"""
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.triggers
+        WHERE trigger_schema = DATABASE() AND trigger_name = %s
+    """, (trigger_name,))
+    return cursor.fetchone()[0] > 0
+
 def execute_sql(cursor, sql, success_msg, skip_msg=None):
     """Execute SQL and handle errors gracefully"""
     try:
@@ -382,6 +390,8 @@ def migrate_database():
             ('sections', 'idx_sections_created_at', 'created_at'),
             ('pins', 'idx_pins_updated_at', 'updated_at'),
             ('pins', 'idx_pins_title', 'title(100)'),
+            ('pins', 'idx_pins_board_user_created_desc', 'board_id, user_id, created_at DESC, id'),
+            ('url_health', 'idx_url_health_pin_status_checked', 'pin_id, status, last_checked'),
         ]
         
         for table, idx_name, column in indexes:
@@ -446,6 +456,163 @@ def migrate_database():
         else:
             warning("api_tokens table already exists")
 
+        # Migration Step 15: Full-text search index on pins
+        info("\nStep 15: Pin search index")
+        if not index_exists(cursor, 'pins', 'ft_pins_title_desc'):
+            cursor.execute("ALTER TABLE pins ADD FULLTEXT INDEX ft_pins_title_desc (title, description)")
+            success("Created FULLTEXT index ft_pins_title_desc on pins")
+        else:
+            warning("ft_pins_title_desc index already exists")
+
+        # Migration Step 16: Denormalized pin count on boards
+        info("\nStep 16: Board pin counts")
+        if not column_exists(cursor, 'boards', 'pin_count'):
+            cursor.execute("ALTER TABLE boards ADD COLUMN pin_count INT NOT NULL DEFAULT 0")
+            success("Added pin_count to boards")
+        else:
+            warning("boards already has pin_count")
+
+        pin_count_triggers = {
+            'trg_pins_ai': """
+                CREATE TRIGGER trg_pins_ai AFTER INSERT ON pins FOR EACH ROW
+                    UPDATE boards SET pin_count = pin_count + 1, updated_at = updated_at WHERE id = NEW.board_id
+            """,
+            'trg_pins_ad': """
+                CREATE TRIGGER trg_pins_ad AFTER DELETE ON pins FOR EACH ROW
+                    UPDATE boards SET pin_count = GREATEST(pin_count - 1, 0), updated_at = updated_at WHERE id = OLD.board_id
+            """,
+            'trg_pins_au': """
+                CREATE TRIGGER trg_pins_au AFTER UPDATE ON pins FOR EACH ROW
+                    UPDATE boards
+                    SET pin_count = GREATEST(pin_count + (id = NEW.board_id) - (id = OLD.board_id), 0),
+                        updated_at = updated_at
+                    WHERE id IN (OLD.board_id, NEW.board_id) AND OLD.board_id <> NEW.board_id
+            """,
+        }
+        for trigger_name, trigger_sql in pin_count_triggers.items():
+            if not trigger_exists(cursor, trigger_name):
+                try:
+                    cursor.execute(trigger_sql)
+                    success(f"Created trigger {trigger_name}")
+                except mysql.connector.Error as e:
+                    warning(
+                        f"Could not create trigger {trigger_name}: {e}. With binary "
+                        "logging on, the migration user needs SUPER or the server "
+                        "needs log_bin_trust_function_creators=1; pin_count will "
+                        "drift until it exists"
+                    )
+            else:
+                warning(f"Trigger {trigger_name} already exists")
+
+        # Reconcile on every run rather than only when the column is added, so
+        # a run that stopped before the backfill (or counts that drifted while a
+        # trigger was missing) is corrected next time. Only wrong rows are
+        # touched. Runs after the triggers so no insert is missed.
+        cursor.execute("""
+            UPDATE boards b
+            LEFT JOIN (
+                SELECT board_id, COUNT(*) AS n FROM pins GROUP BY board_id
+            ) c ON c.board_id = b.id
+            SET b.pin_count = COALESCE(c.n, 0),
+                b.updated_at = b.updated_at
+            WHERE b.pin_count <> COALESCE(c.n, 0)
+        """)
+        conn.commit()
+        if cursor.rowcount:
+            success(f"Backfilled pin_count for {cursor.rowcount} boards")
+        else:
+            warning("pin_count already matches pins for every board")
+
+        # Migration Step 17: Board children cascade with their board
+        info("\nStep 17: Cascade board deletes to sections and pins")
+        for child_table in ('sections', 'pins'):
+            cursor.execute("""
+                SELECT rc.constraint_name, rc.delete_rule
+                FROM information_schema.referential_constraints rc
+                JOIN information_schema.key_column_usage k
+                  ON k.constraint_schema = rc.constraint_schema
+                 AND k.constraint_name = rc.constraint_name
+                 AND k.table_name = rc.table_name
+                WHERE rc.constraint_schema = DATABASE()
+                  AND rc.table_name = %s
+                  AND rc.referenced_table_name = 'boards'
+                  AND k.column_name = 'board_id'
+            """, (child_table,))
+            constraints = cursor.fetchall()
+            if any(rule == 'CASCADE' for _, rule in constraints):
+                warning(f"{child_table}.board_id already cascades")
+                continue
+            # Rows pointing at a missing board would make the new constraint
+            # fail to build; they're unreachable through the app anyway
+            cursor.execute(f"""
+                DELETE c FROM {child_table} c
+                LEFT JOIN boards b ON b.id = c.board_id
+                WHERE c.board_id IS NOT NULL AND b.id IS NULL
+            """)
+            conn.commit()
+            if cursor.rowcount:
+                success(f"Removed {cursor.rowcount} orphaned {child_table} rows")
+            # Drop and re-add in one ALTER so a failure leaves the old
+            # constraint in place rather than no constraint at all
+            clauses = [f"DROP FOREIGN KEY `{constraint_name}`" for constraint_name, _ in constraints]
+            clauses.append(
+                f"ADD CONSTRAINT fk_{child_table}_board_cascade FOREIGN KEY (board_id) "
+                "REFERENCES boards(id) ON DELETE CASCADE"
+            )
+            try:
+                cursor.execute(f"ALTER TABLE {child_table} {', '.join(clauses)}")
+                success(f"{child_table}.board_id now cascades on board delete")
+            except mysql.connector.Error as e:
+                warning(f"Could not add cascading foreign key on {child_table}.board_id: {e}")
+
+        # Migration Step 18: Claim marker for concurrent link-health checks
+        info("\nStep 18: url_health claim marker")
+        if not column_exists(cursor, 'url_health', 'claimed_until'):
+            cursor.execute("ALTER TABLE url_health ADD COLUMN claimed_until DATETIME NULL AFTER archive_url")
+            success("Added claimed_until to url_health")
+        else:
+            warning("url_health already has claimed_until")
+
+        # Migration Step 19: Board pages sort by created_at DESC, id ASC, which
+        # idx_pins_board_user_created_desc (Step 11) stores in that order so
+        # the LIMIT reads straight off the index with no filesort. It covers
+        # every lookup the old all-ascending index served.
+        info("\nStep 19: Board pin order index")
+        if index_exists(cursor, 'pins', 'idx_pins_board_user_created'):
+            cursor.execute("DROP INDEX idx_pins_board_user_created ON pins")
+            success("Dropped superseded idx_pins_board_user_created")
+        else:
+            warning("idx_pins_board_user_created already dropped")
+
+        # Migration Step 20: Board lists are read per user in name order (gallery,
+        # board pickers, the duplicate-name check). (user_id, name) serves them
+        # without a filesort and also backs the user_id foreign key, so the
+        # single-column index it replaces is dropped.
+        info("\nStep 20: Board list index")
+        if not index_exists(cursor, 'boards', 'idx_boards_user_name'):
+            cursor.execute("CREATE INDEX idx_boards_user_name ON boards (user_id, name)")
+            success("Created idx_boards_user_name on boards")
+        else:
+            warning("idx_boards_user_name already exists")
+        if index_exists(cursor, 'boards', 'idx_boards_user_id'):
+            try:
+                cursor.execute("DROP INDEX idx_boards_user_id ON boards")
+                success("Dropped superseded idx_boards_user_id")
+            except mysql.connector.Error as e:
+                warning(f"Could not drop idx_boards_user_id: {e}")
+
+        # Migration Step 21: The link health and board status aggregates join
+        # pins to url_health and read only status and last_checked, which
+        # idx_url_health_pin_status_checked (Step 11) carries, so the join
+        # never touches the table rows. It leads with pin_id and covers every
+        # lookup the old (pin_id, last_checked) index served.
+        info("\nStep 21: url_health covering index")
+        if index_exists(cursor, 'url_health', 'idx_url_health_pin_checked'):
+            cursor.execute("DROP INDEX idx_url_health_pin_checked ON url_health")
+            success("Dropped superseded idx_url_health_pin_checked")
+        else:
+            warning("idx_url_health_pin_checked already dropped")
+
         # Migration Step 12: Summary
         info("\nStep 12: Migration summary")
         cursor.execute("SELECT COUNT(*) FROM users")
@@ -25,6 +25,8 @@ except ImportError:
 
 def add_cached_images_table():
     """Add cached images table to store low-quality cached versions of images"""
+    db = None
+    cursor = None
     try:
         db = get_db_connection()
         cursor = db.cursor()
@@ -126,9 +128,9 @@ def add_cached_images_table():
         print(f"❌ Error: {e}")
         return False
     finally:
-        if 'cursor' in locals():
+        if cursor is not None:
             cursor.close()
-        if 'db' in locals():
+        if db is not None:
             db.close()
     
     return True
@@ -25,6 +25,8 @@ except ImportError:
 
 def add_color_columns():
     """Add dominant color columns to pins table"""
+    db = None
+    cursor = None
     try:
         db = get_db_connection()
         cursor = db.cursor()
@@ -56,9 +58,9 @@ def add_color_columns():
         print(f"❌ Error: {e}")
         return False
     finally:
-        if 'cursor' in locals():
+        if cursor is not None:
             cursor.close()
-        if 'db' in locals():
+        if db is not None:
             db.close()
     
     return True
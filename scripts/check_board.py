@@ -20,6 +20,8 @@ db_config = {
 connection_pool = mysql.connector.pooling.MySQLConnectionPool(**db_config)
 
 def check_board():
+    connection = None
+    cursor = None
     try:
         # Get connection from pool
         connection = connection_pool.get_connection()
@@ -56,9 +58,9 @@ def check_board():
     except Exception as e:
         print(f"Error: {e}")
     finally:
-        if 'cursor' in locals():
+        if cursor is not None:
             cursor.close()
-        if 'connection' in locals():
+        if connection is not None:
             connection.close()
 
 if __name__ == "__main__":
@@ -12,6 +12,8 @@ dbconfig = {
 }
 
 def main():
+    db = None
+    cursor = None
     try:
         # Connect to the database
         db = mysql.connector.connect(**dbconfig)
@@ -51,9 +53,9 @@ def main():
         if db:
             db.rollback()
     finally:
-        if 'cursor' in locals():
+        if cursor is not None:
             cursor.close()
-        if 'db' in locals():
+        if db is not None:
             try:
                 db.close()
             except:
@@ -59,6 +59,8 @@ class DatabaseVersionManager:
     
     def ensure_version_table(self):
         """Create the database version tracking table if it doesn't exist"""
+        db = None
+        cursor = None
         try:
             db = get_db_connection()
             cursor = db.cursor()
@@ -91,13 +93,15 @@ class DatabaseVersionManager:
             print(f"Error creating version table: {e}")
             return False
         finally:
-            if 'cursor' in locals():
+            if cursor is not None:
                 cursor.close()
-            if 'db' in locals():
+            if db is not None:
                 db.close()
     
     def get_applied_versions(self):
         """Get list of applied database versions"""
+        db = None
+        cursor = None
         try:
             if not self.ensure_version_table():
                 return []
@@ -114,9 +118,9 @@ class DatabaseVersionManager:
             print(f"Error getting applied versions: {e}")
             return []
         finally:
-            if 'cursor' in locals():
+            if cursor is not None:
                 cursor.close()
-            if 'db' in locals():
+            if db is not None:
                 db.close()
     
     def get_pending_upgrades(self):
@@ -132,6 +136,8 @@ class DatabaseVersionManager:
     
     def check_column_exists(self, table, column):
         """Check if a column exists in a table"""
+        db = None
+        cursor = None
         try:
             db = get_db_connection()
             cursor = db.cursor()
@@ -150,13 +156,15 @@ class DatabaseVersionManager:
             print(f"Error checking column existence: {e}")
             return False
         finally:
-            if 'cursor' in locals():
+            if cursor is not None:
                 cursor.close()
-            if 'db' in locals():
+            if db is not None:
                 db.close()
     
     def check_table_exists(self, table):
         """Check if a table exists"""
+        db = None
+        cursor = None
         try:
             db = get_db_connection()
             cursor = db.cursor()
@@ -168,9 +176,9 @@ class DatabaseVersionManager:
             print(f"Error checking table existence: {e}")
             return False
         finally:
-            if 'cursor' in locals():
+            if cursor is not None:
                 cursor.close()
-            if 'db' in locals():
+            if db is not None:
                 db.close()
     
     def detect_applied_upgrades(self):
@@ -197,6 +205,8 @@ class DatabaseVersionManager:
     
     def sync_versions(self):
         """Sync the version table with detected applied upgrades"""
+        db = None
+        cursor = None
         try:
             if not self.ensure_version_table():
                 return False
@@ -225,9 +235,9 @@ class DatabaseVersionManager:
             print(f"Error syncing versions: {e}")
             return False
         finally:
-            if 'cursor' in locals():
+            if cursor is not None:
                 cursor.close()
-            if 'db' in locals():
+            if db is not None:
                 db.close()
     
     def apply_upgrade(self, version):
@@ -239,6 +249,8 @@ class DatabaseVersionManager:
         if not upgrade.get('script'):
             return {'success': False, 'error': f'No script defined for upgrade {version}'}
         
+        db = None
+        cursor = None
         try:
             # Import and run the upgrade script
             script_path = f"scripts.{upgrade['script'].replace('.py', '')}"
@@ -278,9 +290,9 @@ class DatabaseVersionManager:
         except Exception as e:
             return {'success': False, 'error': f'Error applying upgrade {version}: {str(e)}'}
         finally:
-            if 'cursor' in locals():
+            if cursor is not None:
                 cursor.close()
-            if 'db' in locals():
+            if db is not None:
                 db.close()
     
     def get_upgrade_status(self):
@@ -19,6 +19,8 @@ dbconfig = {
 
 def fix_url_health_schema_robust():
     """Safely fix the URL health table schema to match the application expectations."""
+    db = None
+    cursor = None
     try:
         # Connect to the database
         db = mysql.connector.connect(**dbconfig)
@@ -120,16 +122,16 @@ def fix_url_health_schema_robust():
         
     except mysql.connector.Error as err:
         print(f"❌ Database error: {err}")
-        if 'db' in locals():
+        if db is not None:
             db.rollback()
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
-        if 'db' in locals():
+        if db is not None:
             db.rollback()
     finally:
-        if 'cursor' in locals():
+        if cursor is not None:
             cursor.close()
-        if 'db' in locals():
+        if db is not None:
             try:
                 db.close()
             except:
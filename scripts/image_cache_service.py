@@ -5,7 +5,6 @@ import os
 import sys
 import requests
 import hashlib
-import time
 from PIL import Image
 import io
 import subprocess
@@ -43,6 +42,9 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# cached_images rows written per dimensions UPDATE (and commit)
+DIMENSION_UPDATE_BATCH_SIZE = 50
+
 class ImageCacheService:
     def __init__(self, cache_dir='static/cached_images', max_workers=6):
         self.cache_dir = cache_dir
@@ -288,52 +290,21 @@ class ImageCacheService:
         url_hash = hashlib.md5(original_url.encode()).hexdigest()[:16]
         return f"{url_hash}_{quality_level}.webp"
     
-    def _get_retry_count(self, image_url, quality_level):
-        """Get current retry count for an image"""
-        try:
-            db = get_db_connection()
-            cursor = db.cursor(dictionary=True)
-            
-            cursor.execute("""
-                SELECT retry_count, last_retry_at FROM cached_images 
-                WHERE original_url = %s AND quality_level = %s
-            """, (image_url, quality_level))
-            
-            result = cursor.fetchone()
-            cursor.close()
-            db.close()
-            
-            if result:
-                return result['retry_count'] or 0, result['last_retry_at']
-            return 0, None
-            
-        except Exception as e:
-            logger.error(f"Error getting retry count: {e}")
-            return 0, None
-    
-    def _should_retry(self, image_url, quality_level, max_retries=3):
-        """Check if we should retry caching this image"""
-        retry_count, last_retry = self._get_retry_count(image_url, quality_level)
+    def _should_retry(self, cached_record, max_retries=3):
+        """Check if we should retry caching, given the image's cached_images row"""
+        if not cached_record:
+            return True
 
-        try:
-            db = get_db_connection()
-            cursor = db.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT cache_status, updated_at FROM cached_images
-                WHERE original_url = %s AND quality_level = %s
-            """, (image_url, quality_level))
-            record = cursor.fetchone()
-            cursor.close()
-            db.close()
-            if record and record['cache_status'] == 'pending' and record['updated_at']:
-                stale_cutoff = datetime.now() - timedelta(hours=1)
-                if record['updated_at'] < stale_cutoff:
-                    return True
-        except Exception as e:
-            logger.warning(f"Could not check pending staleness: {e}")
+        if cached_record['cache_status'] == 'pending' and cached_record['updated_at']:
+            stale_cutoff = datetime.now() - timedelta(hours=1)
+            if cached_record['updated_at'] < stale_cutoff:
+                return True
+
+        retry_count = cached_record['retry_count'] or 0
+        last_retry = cached_record['last_retry_at']
 
         if retry_count >= max_retries:
-            logger.info(f"Max retries ({max_retries}) exceeded for {image_url}")
+            logger.info(f"Max retries ({max_retries}) exceeded for {cached_record['original_url']}")
             return False
         
         # If we've retried recently, use exponential backoff
@@ -343,7 +314,7 @@ class ImageCacheService:
             next_retry_time = last_retry + timedelta(hours=wait_hours)
             
             if datetime.now() < next_retry_time:
-                logger.info(f"Too soon to retry {image_url}, next retry at {next_retry_time}")
+                logger.info(f"Too soon to retry {cached_record['original_url']}, next retry at {next_retry_time}")
                 return False
         
         return True
@@ -364,25 +335,26 @@ class ImageCacheService:
         db = None
         cursor = None
         try:
-            # Check retry logic first
-            if not self._should_retry(image_url, quality_level):
-                return None
-            
-            # Check if already cached
-            cached_filename = self._generate_cache_filename(image_url, quality_level)
-            cached_path = os.path.join(self.cache_dir, cached_filename)
-            
             db = get_db_connection()
             cursor = db.cursor(dictionary=True)
             
-            # Check if already in database
+            # One lookup covers both the retry/backoff check and the
+            # already-cached check
             cursor.execute("""
-                SELECT id, cache_status, cached_filename FROM cached_images
+                SELECT id, original_url, cache_status, cached_filename,
+                       retry_count, last_retry_at, updated_at
+                FROM cached_images
                 WHERE original_url = %s AND quality_level = %s
             """, (image_url, quality_level))
 
             cached_record = cursor.fetchone()
 
+            if not self._should_retry(cached_record):
+                return None
+
+            cached_filename = self._generate_cache_filename(image_url, quality_level)
+            cached_path = os.path.join(self.cache_dir, cached_filename)
+
             existing_path = None
             if cached_record and cached_record.get('cached_filename'):
                 existing_path = os.path.join(self.cache_dir, cached_record['cached_filename'])
@@ -575,38 +547,42 @@ class ImageCacheService:
     
     def _mark_cache_failed(self, image_url, quality_level, error_msg):
         """Mark an image as failed to cache with retry tracking"""
+        db = None
+        cursor = None
         try:
             db = get_db_connection()
             cursor = db.cursor()
             
-            # Get current retry count
-            retry_count, _ = self._get_retry_count(image_url, quality_level)
-            new_retry_count = retry_count + 1
-            
+            # Bump the retry count in place rather than reading it first
             cursor.execute("""
                 INSERT INTO cached_images 
                 (original_url, cached_filename, quality_level, cache_status, retry_count, last_retry_at)
-                VALUES (%s, %s, %s, 'failed', %s, CURRENT_TIMESTAMP)
+                VALUES (%s, %s, %s, 'failed', 1, CURRENT_TIMESTAMP)
                 ON DUPLICATE KEY UPDATE 
                 cache_status = 'failed', 
-                retry_count = %s,
+                retry_count = COALESCE(retry_count, 0) + 1,
                 last_retry_at = CURRENT_TIMESTAMP,
                 updated_at = CURRENT_TIMESTAMP
-            """, (image_url, f"failed_{quality_level}", quality_level, new_retry_count, new_retry_count))
+            """, (image_url, f"failed_{quality_level}", quality_level))
             
             db.commit()
-            logger.warning(f"Marked {'video' if self._is_video_url(image_url) else 'image'} as failed (attempt {new_retry_count}): {image_url} - {error_msg}")
+            logger.warning(f"Marked {'video' if self._is_video_url(image_url) else 'image'} as failed: {image_url} - {error_msg}")
             
         except Exception as e:
             logger.error(f"Failed to mark image as failed: {e}")
         finally:
-            if 'cursor' in locals():
+            if cursor is not None:
                 cursor.close()
-            if 'db' in locals():
-                db.close()
+            if db is not None:
+                try:
+                    db.close()
+                except Exception:
+                    pass
     
     def cache_all_external_images(self, limit=None, board_id=None, process_dimensions=False):
         """Cache all external images for pins that don't have cached versions"""
+        db = None
+        cursor = None
         try:
             db = get_db_connection()
             cursor = db.cursor(dictionary=True)
@@ -652,7 +628,6 @@ class ImageCacheService:
                 logger.info(f"Queuing {media_type} for caching: pin {pin['id']} - {pin['image_url'][:60]}...")
 
                 self.queue_image_for_caching(pin['id'], pin['image_url'], 'low', pin.get('board_id'))
-                time.sleep(0.1)  # Small delay to avoid overwhelming the queue
             
             # Wait for all tasks to complete
             self.task_queue.join()
@@ -666,15 +641,15 @@ class ImageCacheService:
         except Exception as e:
             logger.error(f"Error caching all external images: {e}")
         finally:
-            if 'cursor' in locals() and cursor:
+            if cursor is not None:
                 try:
                     cursor.close()
-                except:
+                except Exception:
                     pass
-            if 'db' in locals() and db:
+            if db is not None:
                 try:
                     db.close()
-                except:
+                except Exception:
                     pass
     
     def process_missing_dimensions(self, board_id=None, limit=100):
@@ -712,6 +687,11 @@ class ImageCacheService:
             logger.info(f"Found {len(pins)} pins with missing dimensions{board_message}")
             
             processed = 0
+            # Dimensions for existing cached_images rows, written in batches of
+            # DIMENSION_UPDATE_BATCH_SIZE: {cache_id: (width, height)}. Pins can
+            # share a cached image, so the pins behind them are counted apart.
+            dimension_updates = {}
+            pending_pins = 0
             for pin in pins:
                 pin_id = pin['pin_id']
                 image_url = pin['image_url']
@@ -760,11 +740,13 @@ class ImageCacheService:
                     # Update dimensions in database
                     if width and height:
                         if cache_id:
-                            cursor.execute("""
-                                UPDATE cached_images 
-                                SET width = %s, height = %s, updated_at = CURRENT_TIMESTAMP
-                                WHERE id = %s
-                            """, (width, height, cache_id))
+                            dimension_updates[cache_id] = (width, height)
+                            pending_pins += 1
+                            if len(dimension_updates) >= DIMENSION_UPDATE_BATCH_SIZE:
+                                batch_pins, pending_pins = pending_pins, 0
+                                self._flush_dimensions(db, cursor, dimension_updates)
+                                processed += batch_pins
+                            continue
                         else:
                             # Create a cached_images record with dimensions only
                             url_hash = hashlib.md5(image_url.encode()).hexdigest()[:16]
@@ -790,6 +772,10 @@ class ImageCacheService:
                     logger.error(f"Error processing dimensions for pin {pin_id}: {e}")
                     continue
             
+            if dimension_updates:
+                self._flush_dimensions(db, cursor, dimension_updates)
+                processed += pending_pins
+            
             logger.info(f"Processed dimensions for {processed}/{len(pins)} pins")
             
         except Exception as e:
@@ -806,8 +792,36 @@ class ImageCacheService:
                 except:
                     pass
     
+    def _flush_dimensions(self, db, cursor, dimension_updates):
+        """Save and commit a batch of dimension updates, then empty it"""
+        try:
+            self._save_dimensions(cursor, dimension_updates)
+            db.commit()
+            logger.info(f"Updated dimensions for {len(dimension_updates)} cached images")
+        finally:
+            dimension_updates.clear()
+    
+    def _save_dimensions(self, cursor, dimension_updates):
+        """Write {cache_id: (width, height)} to cached_images in a single UPDATE"""
+        cases = " ".join(["WHEN %s THEN %s"] * len(dimension_updates))
+        ids = ", ".join(["%s"] * len(dimension_updates))
+        params = []
+        for index in (0, 1):
+            params.extend(value for cache_id, dims in dimension_updates.items()
+                          for value in (cache_id, dims[index]))
+        params.extend(dimension_updates)
+        cursor.execute(f"""
+            UPDATE cached_images
+            SET width = CASE id {cases} END,
+                height = CASE id {cases} END,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id IN ({ids})
+        """, tuple(params))
+    
     def cleanup_old_cache(self, days_old=30):
         """Clean up old cached images that haven't been accessed recently"""
+        db = None
+        cursor = None
         try:
             db = get_db_connection()
             cursor = db.cursor(dictionary=True)
@@ -848,10 +862,13 @@ class ImageCacheService:
         except Exception as e:
             logger.error(f"Error cleaning up old cache: {e}")
         finally:
-            if 'cursor' in locals():
+            if cursor is not None:
                 cursor.close()
-            if 'db' in locals():
-                db.close()
+            if db is not None:
+                try:
+                    db.close()
+                except Exception:
+                    pass
 
 def main():
     """Main function for running the image cache service"""
@@ -29,6 +29,8 @@ def migrate_to_v1_0_1():
     """Run v1.0.1 migration"""
     print("🔄 Starting v1.0.1 migration...")
     
+    db = None
+    cursor = None
     try:
         db = get_db_connection()
         cursor = db.cursor()
@@ -90,19 +92,22 @@ def migrate_to_v1_0_1():
         
     except mysql.connector.Error as err:
         print(f"❌ Database error during migration: {err}")
-        if 'db' in locals():
+        if db is not None:
             db.rollback()
         sys.exit(1)
     except Exception as e:
         print(f"❌ Unexpected error during migration: {e}")
-        if 'db' in locals():
+        if db is not None:
             db.rollback()
         sys.exit(1)
     finally:
-        if 'cursor' in locals():
+        if cursor is not None:
             cursor.close()
-        if 'db' in locals():
-            db.close()
+        if db is not None:
+            try:
+                db.close()
+            except Exception:
+                pass
 
 if __name__ == '__main__':
     migrate_to_v1_0_1() 
\ No newline at end of file